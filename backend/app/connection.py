@@ -0,0 +1,109 @@
+"""
+Outbound side of player WebSocket connections.
+"""
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+from fastapi import WebSocket
+from .wire import WIRE_KEYS, WIRE_TYPES
+
+# Frame wrapping several queued messages: {"type":"batch","data":[msg, ...]}
+# in the compact wire format
+BATCH_PREFIX = ('{"%s":"%s","%s":[' % (WIRE_KEYS["type"], WIRE_TYPES["batch"], WIRE_KEYS["data"])).encode()
+BATCH_SUFFIX = b']}'
+
+# Beyond this many queued messages, lossy ones (movement) are dropped oldest
+# first. Reliable messages are always kept
+MAX_QUEUED_MESSAGES = 64
+# A write taking longer than this means the client has stalled
+SEND_TIMEOUT_SECONDS = 5
+
+class ClientConnection:
+    """
+    A player's WebSocket with a queue of pre-encoded outbound messages.
+    A sender task drains everything queued since its last write into a
+    single batch frame, so bursts of small messages cost one frame.
+    """
+
+    def __init__(self, player_id: str, websocket: WebSocket):
+        self.player_id = player_id
+        self.websocket = websocket
+        # (payload, lossy) pairs waiting for the sender task
+        self.pending: Deque[Tuple[bytes, bool]] = deque()
+        self.ready = asyncio.Event()
+        self.dropped = 0
+        self.sender_task: Optional[asyncio.Task] = None
+        self.close_task: Optional[asyncio.Task] = None
+
+    def enqueue(self, payload: bytes, lossy: bool = False):
+        """
+        Queue an encoded JSON message for the sender task.
+        Lossy messages may be dropped if the client falls behind.
+        """
+        pending = self.pending
+        if len(pending) >= MAX_QUEUED_MESSAGES and lossy:
+            self.dropped += 1
+            # Make room by dropping the oldest lossy message, or this one
+            # if everything queued is reliable
+            for index, (_, queued_lossy) in enumerate(pending):
+                if queued_lossy:
+                    del pending[index]
+                    break
+            else:
+                return
+        pending.append((payload, lossy))
+        self.ready.set()
+
+    def start(self, on_send_error: Callable[["ClientConnection", Exception], None]):
+        """Start the sender task. on_send_error is called if a write fails or times out."""
+        if self.sender_task is None:
+            self.sender_task = asyncio.create_task(self._send_loop(on_send_error))
+
+    def stop(self):
+        """Stop the sender task; anything still queued is dropped"""
+        if self.sender_task is not None:
+            self.sender_task.cancel()
+            self.sender_task = None
+
+    async def close(self, code: int = 1000):
+        self.stop()
+        await self.websocket.close(code=code)
+
+    def abort(self):
+        """
+        Close the socket in the background after a failed or stalled send,
+        so the client's receive loop ends and it reconnects. The close is
+        bounded too, since the socket may be the thing that is stuck.
+        """
+        async def close_quietly():
+            try:
+                await asyncio.wait_for(self.close(code=1011), SEND_TIMEOUT_SECONDS)
+            except Exception:
+                pass
+
+        if self.close_task is None:
+            self.close_task = asyncio.create_task(close_quietly())
+
+    async def _send_loop(self, on_send_error):
+        pending = self.pending
+        ready = self.ready
+        try:
+            while True:
+                # Wait for messages, then take everything that is queued
+                await ready.wait()
+                ready.clear()
+                batch = [payload for payload, _ in pending]
+                pending.clear()
+                if not batch:
+                    continue
+
+                if len(batch) == 1:
+                    frame = batch[0]
+                else:
+                    frame = BATCH_PREFIX + b",".join(batch) + BATCH_SUFFIX
+                await asyncio.wait_for(self.websocket.send_bytes(frame), SEND_TIMEOUT_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.sender_task = None
+            on_send_error(self, e)
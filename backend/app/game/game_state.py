@@ -1,80 +1,212 @@
-from typing import Dict, List, Any
+from typing import Dict, Set, List, Optional, Any
 from ..models.player import Player
-from ..models.bot_player import BotPlayer
+from ..models.bot_player import BotManager, BotPlayer
+from ..wire import pack
 import time
 import asyncio
+import gzip
+import logging
+import numpy as np
+import orjson
+from . import performance_config
+from .move_encoder import MoveEncoder
 from .performance_config import BOT_COUNT, ENABLE_BOT_LIGHT_TRAILS, BOT_CONFIG
 
+logger = logging.getLogger(__name__)
+
 class GameState:
     def __init__(self):
         self.players: Dict[str, Player] = {}
         self.bots: Dict[str, BotPlayer] = {}  # Separate dict for bots
-        self.eliminated_players: List[str] = []
+        self.alive_bots: Dict[str, BotPlayer] = {}  # Bots not yet eliminated
+        # Alive bots split into groups; the bot loop updates one group per tick
+        # so updates are spread out instead of all landing on the same tick
+        self.bot_buckets: List[Dict[str, BotPlayer]] = [
+            {} for _ in range(max(1, BOT_CONFIG.get("update_buckets", 1)))
+        ]
+        # Bot state lives in the manager's columns; each BotPlayer is a view
+        # of one row. Trails follow the admin setting, so they aren't capped
+        self.bot_manager = BotManager(max_active_trails=None)
+        # Manager rows of each bucket, rebuilt after the buckets change
+        self._bucket_rows: List[Optional[np.ndarray]] = [None] * len(self.bot_buckets)
         self.game_phase = "waiting"  # waiting, playing, finished
         self.current_round = 0
         self.min_players = 2  # Reduced for easier testing
-        self.last_bot_update = time.time()
+        self.max_players = 16
+        # Each player occupies one bit of these masks (slot 0..max_players-1)
+        self.player_slots: Dict[str, int] = {}
+        self.slot_players: List[Optional[str]] = [None] * self.max_players
+        self.slots_mask = 0
+        self.alive_mask = 0
+        self.eliminated_mask = 0
+        self.last_bot_update = time.monotonic()
         self.bot_update_task = None
-        print("GameState initialized")
+        self.bot_update_count = 0  # Bot loop ticks, exposed via /metrics
+        self.bot_position_updates = 0  # Bot positions sent, exposed via /metrics
+        # Cached get_state() result, rebuilt only after a mutation
+        self._cached_state = None
+        self._state_dirty = True
+        # Encoded game_state message for new connections. Positions change in
+        # place without marking the state dirty, so moves only drop this
+        self._state_bytes: Optional[bytes] = None
+        # (encoded state, gzip of it), recompressed only when the encoding changes
+        self._state_gzip: Optional[tuple] = None
+        # Last position sent to clients per player/bot, for delta encoding
+        self.move_encoder = MoveEncoder()
+        logger.info("GameState initialized")
+    
+    @property
+    def eliminated_players(self) -> Set[str]:
+        """IDs of all eliminated players and bots"""
+        eliminated = self.bots.keys() - self.alive_bots.keys()
+        mask = self.eliminated_mask
+        while mask:
+            bit = mask & -mask
+            eliminated.add(self.slot_players[bit.bit_length() - 1])
+            mask ^= bit
+        return eliminated
+    
+    def can_join(self, player_id: str) -> bool:
+        """Whether a player can (re)join without exceeding max_players"""
+        return player_id in self.player_slots or self.slots_mask != (1 << self.max_players) - 1
         
     def add_player(self, player_id: str) -> bool:
+        slot = self.player_slots.get(player_id)
+        if slot is None:
+            # Take the lowest free slot
+            free = ~self.slots_mask & ((1 << self.max_players) - 1)
+            if not free:
+                logger.info("Game full, rejecting player %s", player_id)
+                return False
+            bit = free & -free
+            slot = bit.bit_length() - 1
+            self.player_slots[player_id] = slot
+            self.slot_players[slot] = player_id
+            self.slots_mask |= bit
+        bit = 1 << slot
+        self.alive_mask |= bit
+        self.eliminated_mask &= ~bit
         self.players[player_id] = Player(id=player_id)
-        print(f"Added player {player_id}, total players: {len(self.players)}")
+        self._state_dirty = True
+        logger.info("Added player %s, total players: %s", player_id, len(self.players))
         return True
     
     def remove_player(self, player_id: str):
-        if player_id in self.players:
-            del self.players[player_id]
-            print(f"Removed player {player_id}, remaining players: {len(self.players)}")
-        if player_id in self.eliminated_players:
-            self.eliminated_players.remove(player_id)
+        self._state_dirty = True
+        self.move_encoder.forget(player_id)
+        if self.players.pop(player_id, None) is not None:
+            logger.info("Removed player %s, remaining players: %s", player_id, len(self.players))
+        slot = self.player_slots.pop(player_id, None)
+        if slot is not None:
+            bit = 1 << slot
+            self.slot_players[slot] = None
+            self.slots_mask &= ~bit
+            self.alive_mask &= ~bit
+            self.eliminated_mask &= ~bit
     
-    def update_player_position(self, player_id: str, position: Dict[str, Any]):
-        if player_id in self.players:
-            # Update using the player's update_position method
-            self.players[player_id].update_position(position)
+    def update_player_position(self, player_id: str, position: Dict[str, Any]) -> bool:
+        """
+        Store a player's new position.
+        Returns True if the move is large enough to be worth rebroadcasting.
+        """
+        player = self.players.get(player_id)
+        if player is None:
+            return False
+        self._state_bytes = None
+        # Update using the player's update_position method
+        return player.update_position(position)
     
     def eliminate_player(self, player_id: str):
-        if player_id in self.players and player_id not in self.eliminated_players:
-            self.players[player_id].eliminate()
-            self.eliminated_players.append(player_id)
-            print(f"Player {player_id} eliminated")
-        elif player_id in self.bots and player_id not in self.eliminated_players:
-            self.bots[player_id].eliminate()
-            self.eliminated_players.append(player_id)
-            print(f"Bot {player_id} eliminated")
+        # Every player holds a slot, so one lookup tells players and bots apart
+        slot = self.player_slots.get(player_id)
+        if slot is not None:
+            bit = 1 << slot
+            if self.alive_mask & bit:
+                self.players[player_id].eliminate()
+                self.alive_mask &= ~bit
+                self.eliminated_mask |= bit
+                self._state_dirty = True
+                logger.info("Player %s eliminated", player_id)
+            return
+            
+        bot = self.alive_bots.pop(player_id, None)
+        if bot is not None:
+            bot.eliminate()
+            for bucket in self.bot_buckets:
+                bucket.pop(player_id, None)
+            self._bucket_rows = [None] * len(self.bot_buckets)
+            self._state_dirty = True
+            logger.info("Bot %s eliminated", player_id)
     
     def get_state(self) -> dict:
-        # Combine players and bots
-        all_players = {
-            **{player_id: player.to_dict() for player_id, player in self.players.items()},
-            **{bot_id: bot.to_dict() for bot_id, bot in self.bots.items()}
-        }
+        # Player dicts are kept current in place, so the snapshot only needs
+        # rebuilding when membership or game phase changes
+        if not self._state_dirty:
+            return self._cached_state
+            
+        # Combine players and bots into a single dict
+        all_players = {player_id: player.to_dict() for player_id, player in self.players.items()}
+        all_players.update((bot_id, bot.to_dict()) for bot_id, bot in self.bots.items())
         
-        return {
+        self._cached_state = {
             "players": all_players,
-            "eliminated_players": self.eliminated_players,
+            "eliminated_players": list(self.eliminated_players),
             "game_phase": self.game_phase,
             "current_round": self.current_round,
             "player_count": len(self.players) + len(self.bots),
             "min_players": self.min_players,
+            "max_players": self.max_players,
             "bot_count": len(self.bots)
         }
+        self._state_dirty = False
+        self._state_bytes = None
+        return self._cached_state
+    
+    def get_state_bytes(self) -> bytes:
+        """The full game_state message in wire format, cached until the next change"""
+        if self._state_dirty or self._state_bytes is None:
+            self._state_bytes = orjson.dumps(pack({
+                "type": "game_state",
+                "data": self.get_state()
+            }))
+        return self._state_bytes
+    
+    def get_state_gzip(self) -> bytes:
+        """get_state_bytes() gzip-compressed, cached alongside it"""
+        encoded = self.get_state_bytes()
+        if self._state_gzip is None or self._state_gzip[0] is not encoded:
+            # Level 1: most of the size win on repetitive JSON for little CPU
+            self._state_gzip = (encoded, gzip.compress(encoded, 1))
+        return self._state_gzip[1]
     
     def can_start_game(self) -> bool:
-        total_players = len(self.players) + len(self.bots)
-        return total_players >= self.min_players
+        return self.alive_mask.bit_count() + len(self.alive_bots) >= self.min_players
     
     def start_game(self):
         if self.can_start_game():
             self.game_phase = "playing"
             self.current_round = 1
-            self.eliminated_players = []
-            print(f"Game started with {len(self.players)} players and {len(self.bots)} bots")
+            self.alive_mask = self.slots_mask
+            self.eliminated_mask = 0
+            self.alive_bots = dict(self.bots)
+            for bucket in self.bot_buckets:
+                bucket.clear()
+            for i, (bot_id, bot) in enumerate(self.alive_bots.items()):
+                self.bot_buckets[i % len(self.bot_buckets)][bot_id] = bot
+            self._bucket_rows = [None] * len(self.bot_buckets)
+            self._state_dirty = True
+            logger.info("Game started with %s players and %s bots", len(self.players), len(self.bots))
+    
+    def set_bot_light_trails(self, enabled: bool):
+        """Toggle light trails on every bot"""
+        for bot in self.bots.values():
+            bot.set_light_trails(enabled)
+        self._state_dirty = True
     
     def end_game(self):
         self.game_phase = "finished"
-        print("Game ended")
+        self._state_dirty = True
+        logger.info("Game ended")
         
     # Bot-related methods
     
@@ -82,95 +214,135 @@ class GameState:
         """Add a specified number of bots to the game"""
         prefix = BOT_CONFIG.get("prefix", "Bot_")
         
-        print(f"Adding {count} bots with light trails={use_light_trails}, prefix={prefix}")
+        logger.info("Adding %s bots with light trails=%s, prefix=%s", count, use_light_trails, prefix)
         bot_count_before = len(self.bots)
         
+        bot_ids = []
         for i in range(count):
             bot_id = f"{prefix}{i+1}"
             # Skip if bot already exists
             if bot_id in self.bots:
-                print(f"Bot {bot_id} already exists, skipping")
+                logger.debug("Bot %s already exists, skipping", bot_id)
                 continue
-                
-            # Create bot with configured light trail setting
-            bot = BotPlayer(id=bot_id, use_light_trails=use_light_trails)
-            self.bots[bot_id] = bot
-            print(f"Created bot {bot_id} at position {bot.position['x']:.1f}, {bot.position['z']:.1f}")
+            bot_ids.append(bot_id)
+            
+        # Create bots with configured light trail setting, active immediately
+        rows = self.bot_manager.create_bots(bot_ids, use_light_trails, spawn_interval=0)
+        for row in rows:
+            bot = BotPlayer(self.bot_manager, row)
+            self.bots[bot.id] = bot
+            self.alive_bots[bot.id] = bot
+            min(self.bot_buckets, key=len)[bot.id] = bot
+            logger.debug("Created bot %s at position %.1f, %.1f", bot.id, bot.position['x'], bot.position['z'])
+        self._bucket_rows = [None] * len(self.bot_buckets)
             
         bot_count_after = len(self.bots)
         bots_added = bot_count_after - bot_count_before
-        print(f"Added {bots_added} bots. Total bots: {bot_count_after}")
+        self._state_dirty = True
+        logger.info("Added %s bots. Total bots: %s", bots_added, bot_count_after)
         
     def remove_all_bots(self):
         """Remove all bots from the game"""
         bot_count = len(self.bots)
+        for bot_id in self.bots:
+            self.move_encoder.forget(bot_id)
         self.bots.clear()
-        # Remove any eliminated bots from the list
-        self.eliminated_players = [p for p in self.eliminated_players if p in self.players]
-        print(f"All {bot_count} bots removed")
+        self.alive_bots.clear()
+        for bucket in self.bot_buckets:
+            bucket.clear()
+        self._bucket_rows = [None] * len(self.bot_buckets)
+        self.bot_manager.clear()
+        self._state_dirty = True
+        logger.info("All %s bots removed", bot_count)
+    
+    def update_bot_bucket(self, bucket_index: int, delta_time: float, current_time: float,
+                          turn_probability: float = 0.01) -> Dict[str, Dict[str, Any]]:
+        """
+        Move one bucket of alive bots through the bot manager.
+        Returns the changed positions by bot ID.
+        """
+        rows = self._bucket_rows[bucket_index]
+        if rows is None:
+            bucket = self.bot_buckets[bucket_index]
+            rows = np.fromiter((bot.row for bot in bucket.values()), dtype=np.intp, count=len(bucket))
+            self._bucket_rows[bucket_index] = rows
+        
+        manager = self.bot_manager
+        moved, spawned = manager.update_bots(delta_time, current_time, turn_probability, rows)
+        ids = manager.ids
+        positions = manager.positions
+        updates = {ids[row]: positions[row] for row in moved}
+        
+        # Newly spawned bots start appearing in the state
+        if spawned:
+            self._state_dirty = True
+            alive_bots = self.alive_bots
+            updates.update((ids[row], positions[row]) for row in spawned if ids[row] in alive_bots)
+        
+        if updates:
+            self._state_bytes = None
+        return updates
     
     async def start_bot_updates(self, broadcast_callback=None):
         """Start the bot update loop"""
         if self.bot_update_task is not None:
-            print("Bot update task already running, not starting again")
+            logger.info("Bot update task already running, not starting again")
             return  # Already running
             
-        self.last_bot_update = time.time()
-        print(f"Starting bot update loop for {len(self.bots)} bots")
+        self.last_bot_update = time.monotonic()
+        logger.info("Starting bot update loop for %s bots", len(self.bots))
         
         async def bot_update_loop():
-            update_count = 0
+            bucket_count = len(self.bot_buckets)
+            # Each bucket tracks its own last update, since it is only
+            # visited every bucket_count ticks
+            bucket_last_update = [self.last_bot_update] * bucket_count
+            
+            # Bind hot lookups once; config is only re-read after an update
+            clock = time.monotonic
+            sleep = asyncio.sleep
+            config_epoch = performance_config.CONFIG_EPOCH
+            turn_probability = BOT_CONFIG.get("turn_probability", 0.05)
+            
             while True:
                 try:
-                    current_time = time.time()
-                    delta_time = current_time - self.last_bot_update
-                    self.last_bot_update = current_time
+                    if performance_config.CONFIG_EPOCH != config_epoch:
+                        config_epoch = performance_config.CONFIG_EPOCH
+                        turn_probability = BOT_CONFIG.get("turn_probability", 0.05)
                     
-                    turn_probability = BOT_CONFIG.get("turn_probability", 0.05)
+                    bucket_index = self.bot_update_count % bucket_count
+                    current_time = clock()
+                    delta_time = max(0.0, current_time - bucket_last_update[bucket_index])
+                    bucket_last_update[bucket_index] = current_time
+                    self.last_bot_update = current_time
                     
-                    # Update each bot
-                    bot_updates = {}
-                    for bot_id, bot in list(self.bots.items()):
-                        if bot_id in self.eliminated_players:
-                            continue
-                            
-                        # Update bot position
-                        position_changed = bot.update_bot(delta_time, turn_probability)
-                        
-                        # If position changed, add to updates
-                        if position_changed and broadcast_callback:
-                            bot_updates[bot_id] = bot.position
+                    # Update this tick's bucket of live bots
+                    bot_updates = self.update_bot_bucket(bucket_index, delta_time, current_time, turn_probability)
                     
-                    # Broadcast bot updates if callback provided
+                    # Broadcast all bot updates in a single delta-encoded message
                     if broadcast_callback and bot_updates:
-                        for bot_id, position in bot_updates.items():
-                            await broadcast_callback({
-                                "type": "player_moved",
-                                "data": {
-                                    "player_id": bot_id,
-                                    "position": position
-                                }
-                            })
+                        await broadcast_callback({
+                            "type": "players_moved",
+                            "data": self.move_encoder.encode_updates(bot_updates, current_time)
+                        }, lossy=True)
                     
-                    # Log updates periodically (every 50 updates)
-                    update_count += 1
-                    if update_count % 50 == 0:
-                        print(f"Bot update #{update_count}: Updated {len(bot_updates)} bot positions")
+                    self.bot_update_count += 1
+                    self.bot_position_updates += len(bot_updates)
                     
                     # Sleep to prevent CPU overload
-                    await asyncio.sleep(0.1)  # 10 updates per second is plenty for bots
+                    await sleep(0.1)  # 10 updates per second is plenty for bots
                     
                 except Exception as e:
-                    print(f"Error in bot update loop: {str(e)}")
+                    logger.exception("Error in bot update loop: %s", e)
                     await asyncio.sleep(1)  # Longer sleep on error
         
         # Start the update task
         self.bot_update_task = asyncio.create_task(bot_update_loop())
-        print("Bot update task started")
+        logger.info("Bot update task started")
         
     def stop_bot_updates(self):
         """Stop the bot update loop"""
         if self.bot_update_task:
             self.bot_update_task.cancel()
             self.bot_update_task = None
-            print("Bot update task stopped") 
\ No newline at end of file
+            logger.info("Bot update task stopped") 
\ No newline at end of file
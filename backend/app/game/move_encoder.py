@@ -0,0 +1,72 @@
+"""
+Delta encoding for position updates sent to clients.
+"""
+import time
+from typing import Dict, Any, Optional, Tuple
+
+# Each player's position is sent in full at least this often (seconds) so
+# clients that missed a delta (a dropped lossy frame, or a late join)
+# resynchronize. Time-based, since the baseline is shared by every client
+# and dropped frames don't reset it
+KEYFRAME_INTERVAL_SECONDS = 1.0
+
+class MoveEncoder:
+    """
+    Encodes position updates against the last position sent for each player.
+    Keyframes carry the full position; the updates in between carry only the
+    fields that changed.
+    """
+
+    def __init__(self, keyframe_interval: float = KEYFRAME_INTERVAL_SECONDS):
+        self.keyframe_interval = keyframe_interval
+        self._last_sent: Dict[str, Dict[str, Any]] = {}
+        self._keyframe_times: Dict[str, float] = {}
+
+    def encode(self, player_id: str, position: Dict[str, Any],
+               current_time: Optional[float] = None) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Record position as sent for player_id at current_time (time.monotonic()
+        if not given).
+        Returns (is_keyframe, fields to send).
+        """
+        if current_time is None:
+            current_time = time.monotonic()
+        last = self._last_sent.get(player_id)
+        # Copy, since bot positions are mutated in place between updates
+        self._last_sent[player_id] = dict(position)
+
+        if last is None or current_time - self._keyframe_times[player_id] >= self.keyframe_interval:
+            self._keyframe_times[player_id] = current_time
+            return True, position
+        return False, {key: value for key, value in position.items() if last.get(key) != value}
+
+    def encode_updates(self, positions: Dict[str, Dict[str, Any]],
+                       current_time: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Build the data of a players_moved message: full positions under
+        "updates" and changed fields under "deltas".
+        """
+        if current_time is None:
+            current_time = time.monotonic()
+        updates = {}
+        deltas = {}
+        for player_id, position in positions.items():
+            is_keyframe, fields = self.encode(player_id, position, current_time)
+            if is_keyframe:
+                updates[player_id] = fields
+            else:
+                deltas[player_id] = fields
+
+        data = {"updates": updates}
+        if deltas:
+            data["deltas"] = deltas
+        return data
+
+    def forget(self, player_id: str):
+        """Drop a player's baseline so their next update is a keyframe"""
+        self._last_sent.pop(player_id, None)
+        self._keyframe_times.pop(player_id, None)
+
+    def clear(self):
+        self._last_sent.clear()
+        self._keyframe_times.clear()
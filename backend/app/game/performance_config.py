@@ -14,15 +14,19 @@ BOT_CONFIG = {
     "prefix": "Bot_",  # Prefix for bot IDs
     "speed_multiplier": 5.0,  # Bot speed multiplier (default: 1.0)
     "turn_probability": 0.01,  # Probability of bot making a turn in each update
+    "update_buckets": 5,  # Bots are split into this many groups, one updated per tick
 }
 
+# Incremented on every runtime update so long-running loops know to re-read
+CONFIG_EPOCH = 0
+
 # Function to update configuration at runtime
 def update_config(bot_count=None, enable_trails=None, config_updates=None):
     """
     Update performance configuration at runtime.
     Returns the updated configuration.
     """
-    global BOT_COUNT, ENABLE_BOT_LIGHT_TRAILS, BOT_CONFIG
+    global BOT_COUNT, ENABLE_BOT_LIGHT_TRAILS, BOT_CONFIG, CONFIG_EPOCH
     
     if bot_count is not None:
         BOT_COUNT = bot_count
@@ -33,6 +37,8 @@ def update_config(bot_count=None, enable_trails=None, config_updates=None):
     if config_updates and isinstance(config_updates, dict):
         BOT_CONFIG.update(config_updates)
         
+    CONFIG_EPOCH += 1
+        
     # Return current configuration
     return {
         "bot_count": BOT_COUNT,
@@ -0,0 +1,47 @@
+"""
+Logging setup for the game server.
+Records are handed off through a queue and written by a background thread,
+so the event loop never blocks on stdout.
+"""
+import logging
+import logging.handlers
+import os
+import queue
+
+_listener = None
+_handler = None
+
+def setup_logging(level=None):
+    """
+    Route all logging through a QueueHandler drained by a QueueListener.
+    The level defaults to the LOG_LEVEL environment variable, else INFO.
+    Safe to call more than once.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        return
+    
+    if level is None:
+        level = os.getenv("LOG_LEVEL", "INFO").upper()
+    
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    root = logging.getLogger()
+    _handler = logging.handlers.QueueHandler(log_queue)
+    root.addHandler(_handler)
+    root.setLevel(level)
+    
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+def shutdown_logging():
+    """Detach the queue from the root logger, then flush it and stop the background thread"""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
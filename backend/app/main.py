@@ -1,8 +1,14 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, List, Optional
-import json
+from websockets.exceptions import ConnectionClosed
+from typing import Dict, Optional, Tuple
+import orjson
 import asyncio
+import time
+import logging
+from .logging_config import setup_logging, shutdown_logging
+from .connection import ClientConnection
+from .wire import SCHEMA_MESSAGE, pack
 from .game.game_state import GameState
 from .models.player import Player
 from .game.performance_config import BOT_COUNT, ENABLE_BOT_LIGHT_TRAILS, update_config
@@ -14,6 +20,11 @@ class PerformanceSettings(BaseModel):
     enable_light_trails: Optional[bool] = None
     bot_config: Optional[Dict] = None
 
+logger = logging.getLogger(__name__)
+# Per-connection events; connection lifecycle steps are DEBUG so they stay
+# quiet at the default INFO level
+ws_logger = logging.getLogger("tron.ws")
+
 app = FastAPI()
 
 # Configure CORS with specific origins
@@ -37,9 +48,33 @@ app.add_middleware(
 )
 
 # Store active connections and game state
-active_connections: Dict[str, WebSocket] = {}
+active_connections: Dict[str, ClientConnection] = {}
+# Immutable copy of active_connections' values for broadcast to iterate;
+# refreshed only when a connection is added or removed
+connection_snapshot: Tuple[ClientConnection, ...] = ()
 game_state = GameState()
 
+# Player movement is not rebroadcast per message: the latest position of
+# each player is held here and sent SNAPSHOT_HZ times a second in one
+# players_moved message, however fast clients send input
+SNAPSHOT_HZ = 20
+pending_moves: Dict[str, dict] = {}
+snapshot_task: Optional[asyncio.Task] = None
+
+# Inbound messages larger than this are parsed on a worker thread, so one
+# big frame doesn't stall every other connection
+LARGE_MESSAGE_SIZE = 8192
+
+# Key and type mapping for the compact wire format, sent on every connect
+SCHEMA_FRAME = orjson.dumps(SCHEMA_MESSAGE)
+
+# Players whose connection dropped, mapped to the monotonic time at which
+# they are removed unless they reconnect first. A single reaper task
+# processes the due entries
+REMOVAL_DELAY_SECONDS = 5
+pending_removal: Dict[str, float] = {}
+reaper_task: Optional[asyncio.Task] = None
+
 # API endpoint to update performance settings
 @app.post("/performance/settings")
 async def update_performance_settings(settings: PerformanceSettings):
@@ -65,11 +100,8 @@ async def update_performance_settings(settings: PerformanceSettings):
     # If only trail setting changed, update existing bots
     elif settings.enable_light_trails is not None:
         # Update trails on existing bots
-        for bot_id, bot in game_state.bots.items():
-            bot.use_light_trails = settings.enable_light_trails
-            if bot.position:
-                bot.position["useTrails"] = settings.enable_light_trails
-                
+        game_state.set_bot_light_trails(settings.enable_light_trails)
+        for bot_id in game_state.bots:
             # Broadcast updated trail setting
             await broadcast({
                 "type": "player_updated",
@@ -85,24 +117,25 @@ async def update_performance_settings(settings: PerformanceSettings):
 @app.post("/bots/add")
 async def add_bots(count: int = BOT_COUNT, use_light_trails: bool = ENABLE_BOT_LIGHT_TRAILS):
     """Add bots to the game with configurable settings"""
-    print(f"ADMIN: Adding {count} bots with light trails={use_light_trails}")
+    logger.info("ADMIN: Adding %s bots with light trails=%s", count, use_light_trails)
     game_state.add_bots(count, use_light_trails)
     
     # Start bot updates if they're not already running
     if not game_state.bot_update_task:
         await game_state.start_bot_updates(broadcast)
     
-    # Broadcast bot join events to all connected players
-    for bot_id, bot in game_state.bots.items():
-        print(f"ADMIN: Broadcasting bot join for {bot_id}")
-        await broadcast({
-            "type": "player_joined",
-            "data": {
+    # Announce every bot to connected players in a single message
+    await broadcast({
+        "type": "players_joined_bulk",
+        "data": [
+            {
                 "player_id": bot_id,
                 "is_bot": True,
                 "use_light_trails": bot.use_light_trails
             }
-        })
+            for bot_id, bot in game_state.bots.items()
+        ]
+    })
     
     return {"message": f"Added {count} bots with light trails: {use_light_trails}",
             "bot_count": len(game_state.bots)}
@@ -117,11 +150,11 @@ async def remove_bots():
     if game_state.bot_update_task and len(game_state.bots) == 0:
         game_state.stop_bot_updates()
     
-    # Broadcast bot removal events
-    for bot_id in bot_ids:
+    # Broadcast all bot removals in a single message
+    if bot_ids:
         await broadcast({
-            "type": "player_left",
-            "data": {"player_id": bot_id}
+            "type": "players_left",
+            "data": {"player_ids": bot_ids}
         })
     
     return {"message": "All bots removed"}
@@ -130,218 +163,322 @@ async def remove_bots():
 async def root():
     return {"message": "Girgaya Game Server"}
 
+# Handlers for client messages, keyed by message type. Each gets the
+# sending player's id and the message data, and returns True to end the
+# player's session
+
+async def handle_player_move(player_id: str, data: dict):
+    position_data = data["position"]
+    moved = game_state.update_player_position(player_id, position_data)
+    
+    # Sub-threshold moves are stored but not rebroadcast;
+    # the rest wait for the next snapshot
+    if moved:
+        pending_moves[player_id] = position_data
+
+async def handle_player_eliminated(player_id: str, data: dict):
+    game_state.eliminate_player(player_id)
+    await broadcast({
+        "type": "player_eliminated",
+        "data": {"player_id": player_id}
+    })
+
+async def handle_player_kill(player_id: str, data: dict):
+    killer = data.get("killer", "Unknown")
+    victim = data.get("victim", "Unknown")
+    # Extract just the player names, removing any ID suffixes
+    killer_name = killer.partition('-')[0]
+    victim_name = victim.partition('-')[0]
+    
+    logger.info("Kill event: %s killed %s", killer_name, victim_name)
+    
+    # Broadcast kill event to all players
+    await broadcast({
+        "type": "player_kill",
+        "data": {
+            "killer": killer_name,
+            "victim": victim_name
+        }
+    })
+
+async def handle_chat_message(player_id: str, data: dict):
+    sender_id = data.get("player_id", "Unknown")
+    player_name = data.get("player_name", "Unknown")
+    chat_message = data.get("message", "")
+    
+    logger.info("Chat message from %s: %s", player_name, chat_message)
+    
+    # Broadcast chat message to all players
+    await broadcast({
+        "type": "chat_message",
+        "data": {
+            "player_id": sender_id,
+            "player_name": player_name,
+            "message": chat_message
+        }
+    })
+
+async def handle_player_disconnect(player_id: str, data: dict):
+    logger.info("Player %s sent explicit disconnect", player_id)
+    return True
+
+MESSAGE_HANDLERS = {
+    "player_move": handle_player_move,
+    "player_eliminated": handle_player_eliminated,
+    "player_kill": handle_player_kill,
+    "chat_message": handle_chat_message,
+    "player_disconnect": handle_player_disconnect,
+}
+
 @app.websocket("/ws/{player_id}")
 async def websocket_endpoint(websocket: WebSocket, player_id: str):
-    print(f"[WebSocket] Connection attempt from player {player_id}")
+    ws_logger.debug("Connection attempt from player %s", player_id)
+    if not game_state.can_join(player_id):
+        # Closing before accept rejects the handshake
+        ws_logger.info("Game full, rejecting player %s", player_id)
+        await websocket.close(code=1013)
+        return
+        
+    connection = ClientConnection(player_id, websocket)
     try:
-        print(f"[WebSocket] Accepting connection for player {player_id}")
+        ws_logger.debug("Accepting connection for player %s", player_id)
         await websocket.accept()
-        print(f"[WebSocket] Player {player_id} connected successfully")
+        ws_logger.info("Player %s connected successfully", player_id)
+        # Everything after the schema uses the compact wire format
+        await websocket.send_bytes(SCHEMA_FRAME)
         
         # Check if player already exists, if so, handle as a reconnection
         is_reconnection = player_id in active_connections
-        print(f"[WebSocket] Is reconnection: {is_reconnection}")
+        ws_logger.debug("Is reconnection: %s", is_reconnection)
         
         # First update the connection reference (regardless of reconnection status)
         old_connection = active_connections.get(player_id)
-        active_connections[player_id] = websocket
+        set_connection(player_id, connection)
+        pending_removal.pop(player_id, None)
         
         # Close old connection if it exists to prevent duplicate connections
-        if is_reconnection and old_connection != websocket:
+        if is_reconnection and old_connection is not connection:
             try:
-                print(f"[WebSocket] Closing old connection for reconnecting player {player_id}")
+                ws_logger.info("Closing old connection for reconnecting player %s", player_id)
                 await old_connection.close()
             except Exception as e:
-                print(f"[WebSocket] Error closing old connection for {player_id}: {str(e)}")
+                ws_logger.error("Error closing old connection for %s: %s", player_id, e)
         
         # Add player to game state (or update if reconnecting)
         if is_reconnection:
-            print(f"[WebSocket] Player {player_id} is reconnecting")
+            ws_logger.info("Player %s is reconnecting", player_id)
             # Refresh the player state but don't broadcast a new join event
             game_state.update_player(player_id)
         else:
             # For new players, add them to game state
-            print(f"[WebSocket] Adding new player {player_id} to game state")
-            game_state.add_player(player_id)
+            ws_logger.debug("Adding new player %s to game state", player_id)
+            if not game_state.add_player(player_id):
+                # The last slot was taken while this handshake was in progress
+                remove_connection(player_id)
+                await websocket.close(code=1013)
+                return
             # Broadcast new player to others
             await broadcast({
                 "type": "player_joined",
                 "data": {"player_id": player_id}
             }, exclude=player_id)
         
-        # Get current state to send to the player
-        current_state = game_state.get_state()
-        print(f"[WebSocket] Sending game state to {player_id}: {len(current_state['players'])} players")
+        ws_logger.debug("Sending game state to %s", player_id)
         
         try:
-            # Send initial game state to the player
-            await websocket.send_json({
-                "type": "game_state",
-                "data": current_state
-            })
-            print(f"[WebSocket] Initial game state sent to {player_id}")
+            # Send initial game state to the player as gzip-compressed JSON,
+            # the largest frame we send. The compressed state is shared by
+            # every connection made before the next change, so it is
+            # compressed once rather than deflated per connection
+            await websocket.send_bytes(game_state.get_state_gzip())
+            ws_logger.debug("Initial game state sent to %s", player_id)
         except Exception as e:
-            print(f"[WebSocket] Error sending initial game state to {player_id}: {str(e)}")
+            ws_logger.error("Error sending initial game state to %s: %s", player_id, e)
             raise
         
+        # Broadcasts queued since registering are sent only after the state
+        connection.start(handle_send_error)
+        
+        # Bots added at startup begin moving once someone is watching
+        if game_state.bots and not game_state.bot_update_task:
+            await game_state.start_bot_updates(broadcast)
+        
         # Handle messages from the player
+        loop = asyncio.get_running_loop()
         while True:
             try:
                 data = await websocket.receive_text()
-                print(f"[WebSocket] Received message from {player_id}: {data[:100]}...")  # Log first 100 chars
-                message = json.loads(data)
-                
-                # Handle player movement
-                if message["type"] == "player_move":
-                    position_data = message["data"]["position"]
-                    game_state.update_player_position(
-                        player_id,
-                        position_data
-                    )
-                    
-                    # Create a message with complete position data
-                    move_data = {
-                        "player_id": player_id,
-                        "position": position_data
-                    }
-                    
-                    # Broadcast movement to other players
-                    await broadcast({
-                        "type": "player_moved",
-                        "data": move_data
-                    }, exclude=player_id)
-                
-                # Handle player elimination
-                elif message["type"] == "player_eliminated":
-                    game_state.eliminate_player(player_id)
-                    await broadcast({
-                        "type": "player_eliminated",
-                        "data": {"player_id": player_id}
-                    })
-                
-                # Handle player kill events
-                elif message["type"] == "player_kill":
-                    killer = message["data"].get("killer", "Unknown")
-                    victim = message["data"].get("victim", "Unknown")
-                    # Extract just the player names, removing any ID suffixes
-                    killer_name = killer.split('-')[0] if '-' in killer else killer
-                    victim_name = victim.split('-')[0] if '-' in victim else victim
-                    
-                    print(f"Kill event: {killer_name} killed {victim_name}")
-                    
-                    # Broadcast kill event to all players
-                    await broadcast({
-                        "type": "player_kill",
-                        "data": {
-                            "killer": killer_name,
-                            "victim": victim_name
-                        }
-                    })
-                
-                # Handle chat messages
-                elif message["type"] == "chat_message":
-                    player_id = message["data"].get("player_id", "Unknown")
-                    player_name = message["data"].get("player_name", "Unknown")
-                    chat_message = message["data"].get("message", "")
-                    
-                    print(f"Chat message from {player_name}: {chat_message}")
-                    
-                    # Broadcast chat message to all players
-                    await broadcast({
-                        "type": "chat_message",
-                        "data": {
-                            "player_id": player_id,
-                            "player_name": player_name,
-                            "message": chat_message
-                        }
-                    })
+                if ws_logger.isEnabledFor(logging.DEBUG):
+                    ws_logger.debug("Received message from %s: %s...", player_id, data[:100])  # Log first 100 chars
+                if len(data) > LARGE_MESSAGE_SIZE:
+                    message = await loop.run_in_executor(None, orjson.loads, data)
+                else:
+                    message = orjson.loads(data)
                 
-                # Handle explicit player disconnect
-                elif message["type"] == "player_disconnect":
-                    print(f"Player {player_id} sent explicit disconnect")
+                # Dispatch on message type; unknown types are ignored
+                handler = MESSAGE_HANDLERS.get(message["type"])
+                if handler is not None and await handler(player_id, message.get("data", {})):
                     break
                     
             except WebSocketDisconnect:
-                print(f"[WebSocket] Player {player_id} disconnected")
+                ws_logger.info("Player %s disconnected", player_id)
                 break
+            except orjson.JSONDecodeError as e:
+                # A malformed message is dropped without ending the session
+                ws_logger.warning("Invalid JSON from %s: %s", player_id, e)
             except Exception as e:
-                print(f"[WebSocket] Error processing message from {player_id}: {str(e)}")
+                ws_logger.error("Error processing message from %s: %s", player_id, e)
                 break
                 
     except WebSocketDisconnect:
-        print(f"[WebSocket] WebSocket disconnect in message loop for {player_id}")
+        ws_logger.debug("WebSocket disconnect in message loop for %s", player_id)
     except Exception as e:
-        print(f"[WebSocket] Error handling WebSocket for {player_id}: {str(e)}")
+        ws_logger.error("Error handling WebSocket for %s: %s", player_id, e)
     finally:
         # Cleanup
-        if player_id in active_connections and active_connections[player_id] == websocket:
-            print(f"[WebSocket] Cleaning up connection for {player_id}")
-            del active_connections[player_id]
+        connection.stop()
+        if active_connections.get(player_id) is connection:
+            ws_logger.debug("Cleaning up connection for %s", player_id)
+            remove_connection(player_id)
+            pending_moves.pop(player_id, None)
             game_state.remove_player(player_id)
             await broadcast({
                 "type": "player_left",
                 "data": {"player_id": player_id}
             })
+            # Give the player time to reconnect before final removal
+            schedule_removal(player_id)
+
+def schedule_removal(player_id: str):
+    """Remove a player after REMOVAL_DELAY_SECONDS unless they reconnect"""
+    pending_removal[player_id] = time.monotonic() + REMOVAL_DELAY_SECONDS
+
+async def reaper_loop():
+    """Once a second, remove players whose reconnect window has passed"""
+    while True:
+        await asyncio.sleep(1)
+        if not pending_removal:
+            continue
+        try:
+            now = time.monotonic()
+            due = [player_id for player_id, deadline in pending_removal.items() if deadline <= now]
+            for player_id in due:
+                del pending_removal[player_id]
             
-        # Start a delayed removal task 
-        asyncio.create_task(delayed_player_removal(player_id))
+            # Remove players who haven't reconnected after the delay
+            departed = [player_id for player_id in due if player_id not in active_connections]
+            if departed:
+                logger.info("Players %s didn't reconnect within %ss, removing", departed, REMOVAL_DELAY_SECONDS)
+                for player_id in departed:
+                    game_state.remove_player(player_id)
+                # Announce every departure in a single message
+                await broadcast({
+                    "type": "players_left",
+                    "data": {"player_ids": departed}
+                })
+                logger.info("Active players: %s", len(active_connections))
+                
+                # If no real players left, stop bot updates
+                if len(active_connections) == 0 and game_state.bot_update_task:
+                    logger.info("No players left, stopping bot updates")
+                    game_state.stop_bot_updates()
+        except Exception as e:
+            logger.exception("Error removing disconnected players: %s", e)
 
-# Add a delayed player removal function to handle temporary disconnections
-async def delayed_player_removal(player_id: str, delay_seconds: int = 5):
-    """Remove player after a delay to allow for reconnections"""
-    try:
-        await asyncio.sleep(delay_seconds)
-        
-        # If player hasn't reconnected after the delay, remove them
-        if player_id not in active_connections:
-            print(f"Player {player_id} didn't reconnect within {delay_seconds}s, removing")
-            game_state.remove_player(player_id)
+def set_connection(player_id: str, connection: ClientConnection):
+    """Register a player's connection and refresh the broadcast snapshot"""
+    global connection_snapshot
+    active_connections[player_id] = connection
+    connection_snapshot = tuple(active_connections.values())
+
+def remove_connection(player_id: str):
+    """Drop a player's connection and refresh the broadcast snapshot"""
+    global connection_snapshot
+    active_connections.pop(player_id).stop()
+    connection_snapshot = tuple(active_connections.values())
+
+def handle_send_error(connection: ClientConnection, error: Exception):
+    """
+    Drop a connection whose sender failed or stalled and close its socket so
+    the client reconnects (don't remove the player immediately)
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        logger.warning("Send to %s timed out, dropping connection", connection.player_id)
+    elif not isinstance(error, (WebSocketDisconnect, ConnectionClosed)):
+        logger.error("Error sending to %s: %s", connection.player_id, error)
+    # Skip players who already reconnected on a new socket
+    connection.abort()
+    if active_connections.get(connection.player_id) is connection:
+        remove_connection(connection.player_id)
+        schedule_removal(connection.player_id)
+
+async def snapshot_loop():
+    """Broadcast the positions received since the last tick, SNAPSHOT_HZ times a second"""
+    global pending_moves
+    interval = 1 / SNAPSHOT_HZ
+    while True:
+        await asyncio.sleep(interval)
+        if not pending_moves:
+            continue
+        try:
+            updates = pending_moves
+            pending_moves = {}
             await broadcast({
-                "type": "player_left",
-                "data": {"player_id": player_id}
-            })
-            print(f"Active players: {len(active_connections)}")
-            
-            # If no real players left, stop bot updates
-            if len(active_connections) == 0 and game_state.bot_update_task:
-                print("DEBUG: No players left, stopping bot updates")
-                game_state.stop_bot_updates()
-    except Exception as e:
-        print(f"Error in delayed player removal for {player_id}: {str(e)}")
+                "type": "players_moved",
+                "data": game_state.move_encoder.encode_updates(updates)
+            }, lossy=True)
+        except Exception as e:
+            logger.exception("Error broadcasting movement snapshot: %s", e)
 
-async def broadcast(message: dict, exclude: str = None):
-    disconnected_players = []
-    for player_id, connection in active_connections.items():
-        if player_id != exclude:
-            try:
-                await connection.send_json(message)
-            except WebSocketDisconnect:
-                disconnected_players.append(player_id)
-            except Exception as e:
-                print(f"Error broadcasting to {player_id}: {str(e)}")
-                disconnected_players.append(player_id)
-    
-    # Schedule cleanup for any disconnected players (don't remove immediately)
-    for player_id in disconnected_players:
-        if player_id in active_connections:
-            del active_connections[player_id]
-            # Create a task to handle delayed removal
-            asyncio.create_task(delayed_player_removal(player_id))
+async def broadcast(message: dict, exclude: str = None, lossy: bool = False):
+    # Encode once and queue the same bytes on every connection; each
+    # connection's sender task batches and writes them independently, so one
+    # slow client does not hold up the others. Lossy messages (movement) may
+    # be dropped for clients that have fallen behind
+    payload = orjson.dumps(pack(message))
+    if exclude is None:
+        for connection in connection_snapshot:
+            connection.enqueue(payload, lossy)
+    else:
+        for connection in connection_snapshot:
+            if connection.player_id != exclude:
+                connection.enqueue(payload, lossy)
 
 # Startup event to initialize the app
 @app.on_event("startup")
 async def startup_event():
-    print(f"Server starting with BOT_COUNT={BOT_COUNT}, ENABLE_BOT_LIGHT_TRAILS={ENABLE_BOT_LIGHT_TRAILS}")
-
-# Add bots when the server starts for immediate testing
-@app.on_event("startup")
-async def add_initial_bots():
-    print(f"Adding {BOT_COUNT} initial bots for testing")
-    game_state.add_bots(BOT_COUNT, ENABLE_BOT_LIGHT_TRAILS)
-    print(f"Added {len(game_state.bots)} bots on startup")
+    global snapshot_task, reaper_task
+    setup_logging()
+    logger.info("Server starting with BOT_COUNT=%s, ENABLE_BOT_LIGHT_TRAILS=%s", BOT_COUNT, ENABLE_BOT_LIGHT_TRAILS)
+    snapshot_task = asyncio.create_task(snapshot_loop())
+    reaper_task = asyncio.create_task(reaper_loop())
     
-    # NOTE: We can't start updates here because we don't have the broadcast function yet
-    # Updates will start when first player connects
+    # Add bots when the server starts for immediate testing. Bot updates
+    # start when the first player connects
+    if not game_state.bots:
+        logger.info("Adding %s initial bots for testing", BOT_COUNT)
+        game_state.add_bots(BOT_COUNT, ENABLE_BOT_LIGHT_TRAILS)
+        logger.info("Added %s bots on startup", len(game_state.bots))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in (snapshot_task, reaper_task):
+        if task is not None:
+            task.cancel()
+    shutdown_logging()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Server counters for monitoring"""
+    return {
+        "connections": len(active_connections),
+        "players": len(game_state.players),
+        "bots": len(game_state.bots),
+        "alive_bots": len(game_state.alive_bots),
+        "bot_update_ticks": game_state.bot_update_count,
+        "bot_position_updates": game_state.bot_position_updates,
+        "dropped_messages": sum(connection.dropped for connection in connection_snapshot)
+    }
 
 @app.get("/api/player-count")
 async def get_player_count():
@@ -350,9 +487,14 @@ async def get_player_count():
     real_players = len(active_connections)
     bot_players = len(game_state.bots)
     total_players = real_players + bot_players
-    print(f"Player count requested: real={real_players}, bots={bot_players}, total={total_players}")
+    logger.debug("Player count requested: real=%s, bots=%s, total=%s", real_players, bot_players, total_players)
     return {"count": total_players}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info") 
\ No newline at end of file
+    # The websockets implementation negotiates permessage-deflate, which
+    # compresses the repetitive game_state and movement JSON. "auto" picks
+    # uvloop and httptools where installed (uvloop is unavailable on Windows)
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info",
+                loop="auto", http="auto",
+                ws="websockets", ws_per_message_deflate=True) 
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Compiled movement kernel for BotManager.
+Used when Numba is installed (it is optional); otherwise BotManager keeps
+its NumPy implementation.
+"""
+import math
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Random numbers the kernel consumes per bot per tick; drawn in one batch by
+# the caller since the kernel can't use the random module
+RANDOM_COLUMNS = 8
+
+PI = math.pi
+TWO_PI = 2 * math.pi
+
+# The argument types BotManager passes. Giving them to njit compiles the
+# kernel (or loads it from the on-disk cache) at import, rather than on the
+# first bot tick where it would stall the event loop for about a second
+STEP_BOTS_SIGNATURE = (
+    "void(intp[::1], float32[::1], float32[::1], float32[::1], float32[::1], "
+    "float64[::1], float64, float64, float64, float64, float32[:, ::1])"
+)
+
+if njit is not None:
+    @njit(STEP_BOTS_SIGNATURE, parallel=True, fastmath=True, cache=True)
+    def step_bots(index, x, z, direction, speed, next_turn, current_time,
+                  delta_time, turn_probability, half_size, rnd):
+        """
+        Turn, move and bounce the bots at the rows in index, in place.
+        rnd holds RANDOM_COLUMNS uniform [0, 1) numbers per row of index.
+        """
+        for k in prange(index.shape[0]):
+            i = index[k]
+            r = rnd[k]
+            d = direction[i]
+            
+            # Scheduled 45-90 degree turn, else a chance of a 22.5-45 degree one
+            if current_time >= next_turn[i]:
+                sign = 1.0 if r[0] < 0.5 else -1.0
+                d += sign * (PI / 4 + r[1] * PI / 4)
+                next_turn[i] = current_time + 1.0 + 4.0 * r[2]
+            elif r[3] < turn_probability:
+                sign = 1.0 if r[4] < 0.5 else -1.0
+                d += sign * (PI / 8 + r[5] * PI / 8)
+            
+            step = speed[i] * delta_time
+            xi = x[i] + math.sin(d) * step
+            zi = z[i] + math.cos(d) * step
+            
+            # If hitting a boundary, bounce with a random angle
+            if abs(xi) > half_size:
+                xi = math.copysign(half_size, xi)
+                d = PI - d + (r[6] * 0.4 - 0.2)
+            if abs(zi) > half_size:
+                zi = math.copysign(half_size, zi)
+                d = -d + (r[7] * 0.4 - 0.2)
+            
+            x[i] = xi
+            z[i] = zi
+            direction[i] = np.fmod(d, TWO_PI)
+else:
+    step_bots = None
@@ -1,222 +1,450 @@
 """
 Bot player model for performance testing.
 """
-from typing import Dict, Any, List, Optional
-import random
+from typing import Dict, Any, List, Optional, Tuple
+import heapq
+import logging
 import math
 import time
-from pydantic import Field
+import numpy as np
 from .player import Player
+from .bot_kernel import RANDOM_COLUMNS, step_bots
+
+logger = logging.getLogger(__name__)
+
+TWO_PI = 2 * math.pi
+HALF_SIZE = 500 / 2  # Bots bounce off the edges of the 500 unit arena
+
+# Copied for each new bot's position; copying a dict with the keys already
+# hashed and laid out is quicker than building one from a literal
+_POSITION_TEMPLATE = {
+    "x": 0.0,
+    "y": 0.25,  # Standard height
+    "z": 0.0,
+    "rotation": 0.0,
+    "speed": 0.0,
+    "useTrails": False
+}
+
+# Side of a BotManager spatial hash cell, in world units (arena is 500 across)
+GRID_CELL_SIZE = 20
 
 class BotPlayer(Player):
     """
     Bot player that moves automatically in the game world.
-    Used for performance testing with configurable parameters.
+    A view of one BotManager row: the bot's state lives in the manager's
+    columns, and the position dict is shared with the manager, which keeps
+    it current as the bot moves.
     """
-    use_light_trails: bool = Field(default=False)  # Default to no trails for performance
-    speed: float = Field(default=0.0)
-    direction: float = Field(default=0.0)
-    next_turn_time: float = Field(default=0.0)
-    last_update_time: float = Field(default=0.0)
-    active: bool = Field(default=False)
-    spawn_time: float = Field(default=0.0)
-    update_frequency: float = Field(default=0.1)  # Only update position every 100ms
-    last_position_update: float = Field(default=0.0)
-    
-    def __init__(self, id: str, use_light_trails: bool = False, spawn_delay: float = 0.0):
-        super().__init__(id=id)
-        self.use_light_trails = use_light_trails
-        self.speed = random.uniform(40, 80)  # Increased speed range
-        self.direction = random.uniform(0, 2 * math.pi)  # Random initial direction
-        self.next_turn_time = random.uniform(1, 5)  # Time until next turn
-        self.last_update_time = 0
-        self.last_position_update = 0
-        self.active = spawn_delay <= 0
-        self.spawn_time = time.time() + spawn_delay
-        
-        # Initial position in a random location
-        arena_size = 500
-        self.position = {
-            "x": random.uniform(-arena_size/2, arena_size/2),
-            "y": 0.25,  # Standard height
-            "z": random.uniform(-arena_size/2, arena_size/2),
-            "rotation": self.direction,
-            "speed": self.speed,
-            "useTrails": self.use_light_trails
-        }
-        
-        log_msg = f"Bot {id} created: speed={self.speed:.1f}, trails={use_light_trails}, pos=({self.position['x']:.1f}, {self.position['z']:.1f})"
-        if not self.active:
-            log_msg += f", will spawn in {spawn_delay:.1f}s"
-        print(log_msg)
+    __slots__ = ("manager", "row")
     
-    def update_bot(self, delta_time: float, turn_probability: float = 0.01) -> bool:
-        """
-        Update bot position based on its current direction and speed.
-        Returns True if position was changed, False otherwise.
-        """
-        # Check if bot should be activated based on server time
-        current_time = time.time()
-        if not self.active:
-            if current_time >= self.spawn_time:
-                self.active = True
-                print(f"Bot {self.id} activated")
-                return True
-            return False
-            
-        # Throttle updates to reduce CPU usage
-        self.last_update_time += delta_time
-        if current_time - self.last_position_update < self.update_frequency:
-            return False
-            
-        self.last_position_update = current_time
-        position_changed = False
-        
-        # Check if it's time to change direction
-        if self.last_update_time >= self.next_turn_time:
-            # Randomly decide to turn left or right
-            turn_direction = random.choice([-1, 1])
-            turn_amount = random.uniform(math.pi/4, math.pi/2)  # 45-90 degree turn
-            self.direction += turn_direction * turn_amount
-            
-            # Normalize direction to 0-2π
-            self.direction = self.direction % (2 * math.pi)
-            
-            # Set time for next turn
-            self.next_turn_time = self.last_update_time + random.uniform(1, 5)
-            position_changed = True
-        
-        # Random chance to make an additional turn (for more natural movement)
-        # Reduced probability to decrease calculation load
-        elif random.random() < turn_probability:
-            turn_direction = random.choice([-1, 1])
-            turn_amount = random.uniform(math.pi/8, math.pi/4)  # 22.5-45 degree turn
-            self.direction += turn_direction * turn_amount
-            self.direction = self.direction % (2 * math.pi)
-            position_changed = True
-        
-        # Update position based on direction and speed
-        old_x = self.position["x"]
-        old_z = self.position["z"]
-        
-        self.position["x"] += math.sin(self.direction) * self.speed * delta_time
-        self.position["z"] += math.cos(self.direction) * self.speed * delta_time
-        self.position["rotation"] = self.direction
-        
-        # Boundary check (arena bounds)
-        arena_size = 500
-        half_size = arena_size / 2
-        
-        # If hitting a boundary, bounce with a random angle
-        if abs(self.position["x"]) > half_size:
-            self.position["x"] = half_size * (1 if self.position["x"] > 0 else -1)
-            self.direction = math.pi - self.direction + random.uniform(-0.2, 0.2)
-            position_changed = True
-            
-        if abs(self.position["z"]) > half_size:
-            self.position["z"] = half_size * (1 if self.position["z"] > 0 else -1)
-            self.direction = -self.direction + random.uniform(-0.2, 0.2)
-            position_changed = True
-            
-        # Normalize direction after bounces
-        self.direction = self.direction % (2 * math.pi)
-        
-        # Calculate distance moved
-        distance_moved = math.sqrt((self.position["x"] - old_x)**2 + (self.position["z"] - old_z)**2)
-        if distance_moved > 0:
-            position_changed = True
-        
-        return position_changed
+    def __init__(self, manager: "BotManager", row: int):
+        super().__init__(id=manager.ids[row], position=manager.positions[row])
+        self.manager = manager
+        self.row = row
+    
+    @property
+    def use_light_trails(self) -> bool:
+        return bool(self.manager.use_trails[self.row])
+    
+    @property
+    def speed(self) -> float:
+        return float(self.manager.speed[self.row])
+    
+    @property
+    def direction(self) -> float:
+        return float(self.manager.direction[self.row])
+    
+    @property
+    def active(self) -> bool:
+        return bool(self.manager.active[self.row])
     
     def to_dict(self) -> Dict:
         """Return bot data including trail settings"""
         # Only return data if the bot is active
         if not self.active:
             return None
-            
-        data = super().to_dict()
-        data["is_bot"] = True
-        data["use_light_trails"] = self.use_light_trails
-        data["active"] = self.active
-        
-        # Ensure position includes useTrails property
-        if self.position and "useTrails" not in self.position:
-            self.position["useTrails"] = self.use_light_trails
-            
+        
+        # The position dict is mutated in place by the manager, so the cached
+        # dict stays current without being rebuilt. useTrails is written into
+        # the position at creation and by set_light_trails only
+        data = self._dict
+        if data is None:
+            data = super().to_dict()
+            data["is_bot"] = True
+            data["use_light_trails"] = self.use_light_trails
+            data["active"] = True
         return data
+    
+    def set_light_trails(self, enabled: bool):
+        """Toggle light trails, keeping the position and cached dict in sync"""
+        enabled = self.manager.set_light_trails(self.row, enabled)
+        if self._dict is not None:
+            self._dict["use_light_trails"] = enabled
 
 class BotManager:
-    """Manages bot spawning and lifecycle with performance optimizations"""
+    """
+    Manages bot spawning and lifecycle with performance optimizations.
+    Bot state is kept as a structure of arrays (one NumPy column per field)
+    so a tick updates every bot with a handful of vectorized operations
+    instead of a Python loop over BotPlayer objects.
+    Times are on the time.monotonic() clock and are passed in by the caller.
+    """
     
-    def __init__(self):
-        self.bots: List[BotPlayer] = []
-        self.max_active_trails = 2  # Further reduce max trail bots for performance
+    def __init__(self, capacity: int = 64, seed: Optional[int] = None,
+                 max_active_trails: Optional[int] = 2):
+        # Further reduce max trail bots for performance; None lifts the limit
+        self.max_active_trails = max_active_trails
+        self.trails_count = 0  # Bots with trails, kept up to date by create/remove
         self.max_concurrent_spawns = 3  # Maximum bots that can spawn simultaneously
-        self.last_spawn_check = 0
-        self.spawn_check_interval = 1.0  # Check for new spawns every second
+        self.spawn_check_interval = 1.0  # Postponed spawns wait two of these
+        self.update_frequency = 0.1  # Only update positions every 100ms
+        # One generator for all bot randomness, drawn from in per-tick batches
+        self.rng = np.random.default_rng(seed)
+        
+        # Each bot occupies one row of every column, ids[row] is its ID and
+        # rows maps back; only the first count rows are used. positions[row]
+        # is the bot's position dict, synced from the columns when it moves
+        self.count = 0
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.positions: List[Optional[Dict[str, Any]]] = []
+        # Rows below count left by removed bots, reused before growing
+        self._free: List[int] = []
+        self._allocate(capacity)
+        
+        # Inactive bots as a heap of (spawn_time, row), and the rows of
+        # active bots in activation order, so ticks skip bots not yet spawned
+        self.pending: List[Tuple[float, int]] = []
+        self.active_index = np.zeros(0, dtype=np.intp)
+        
+        # Spatial hash of active bots: (cell x, cell z) -> rows. Dropped when
+        # bots move and rebuilt by the next neighbor query, so ticks with no
+        # queries don't pay for it
+        self._grid: Optional[Dict[Tuple[int, int], List[int]]] = None
     
-    def create_bots(self, count: int, spawn_interval: float = 5.0) -> List[BotPlayer]:
-        """Create multiple bots with staggered spawn times"""
-        new_bots = []
+    def _allocate(self, capacity: int):
+        """(Re)allocate the state columns, keeping the first count rows"""
+        def column(old, dtype):
+            new = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
         
-        # Count existing bots with trails
-        trails_count = sum(1 for bot in self.bots if bot.use_light_trails)
+        self.capacity = capacity
+        # Positions, angles and speeds are well within float32 precision in a
+        # 500 unit arena; the time columns below hold clock readings and
+        # need float64
+        self.x = column(getattr(self, "x", None), np.float32)
+        self.z = column(getattr(self, "z", None), np.float32)
+        self.direction = column(getattr(self, "direction", None), np.float32)
+        self.speed = column(getattr(self, "speed", None), np.float32)
+        self.next_turn = column(getattr(self, "next_turn", None), np.float64)
+        self.last_move = column(getattr(self, "last_move", None), np.float64)
+        self.spawn_time = column(getattr(self, "spawn_time", None), np.float64)
+        self.active = column(getattr(self, "active", None), np.bool_)
+        self.use_trails = column(getattr(self, "use_trails", None), np.bool_)
         
-        for i in range(count):
+        # Scratch space for the NumPy movement step, reused every tick
+        self._sin = np.empty(capacity, dtype=np.float32)
+        self._cos = np.empty(capacity, dtype=np.float32)
+        self._step = np.empty(capacity, dtype=np.float32)
+    
+    def create_bots(self, bot_ids: List[str], use_light_trails: bool = True,
+                    spawn_interval: float = 5.0, current_time: Optional[float] = None) -> List[int]:
+        """
+        Create bots with staggered spawn times, returning their rows.
+        With spawn_interval <= 0 the bots are active immediately.
+        """
+        count = len(bot_ids)
+        # Reuse rows freed by remove_bot first, then take fresh ones
+        reused = self._free[-count:] if count else []
+        del self._free[len(self._free) - len(reused):]
+        fresh = count - len(reused)
+        if self.count + fresh > self.capacity:
+            self._allocate(max(self.capacity * 2, self.count + fresh))
+        rows = np.array(reused + list(range(self.count, self.count + fresh)), dtype=np.intp)
+        
+        if current_time is None:
+            current_time = time.monotonic()
+        
+        rng = self.rng
+        if spawn_interval > 0:
             # Add randomness to spawn time to prevent multiple bots from spawning exactly together
             # Stagger with base interval plus small random offset
-            spawn_delay = i * spawn_interval + random.uniform(0.5, 2.0)
-            
-            # Determine if this bot should use trails based on performance constraints
-            # Very limited number of trail bots for performance
-            use_trails = (trails_count < self.max_active_trails)
-            
-            # Create bot with appropriate settings
-            bot_id = f"bot_{len(self.bots) + i + 1}"
-            bot = BotPlayer(id=bot_id, use_light_trails=use_trails, spawn_delay=spawn_delay)
-            
-            if use_trails:
-                trails_count += 1
-                
-            new_bots.append(bot)
-            
-        self.bots.extend(new_bots)
-        return new_bots
-    
-    def update_all_bots(self, delta_time: float) -> List[str]:
-        """Update all bots and return IDs of bots that changed position"""
-        changed_bots = []
-        current_time = time.time()
-        
-        # Throttle spawn checks to reduce CPU load
-        if current_time - self.last_spawn_check >= self.spawn_check_interval:
-            self.last_spawn_check = current_time
-            
-            # Count bots activated in the last spawn interval
-            recent_spawns = 0
-            for bot in self.bots:
-                if not bot.active and current_time - bot.spawn_time < self.spawn_check_interval:
-                    recent_spawns += 1
-            
-            # If too many bots scheduled to spawn at once, postpone some
-            if recent_spawns > self.max_concurrent_spawns:
-                postponed = 0
-                for bot in self.bots:
-                    if not bot.active and current_time - bot.spawn_time < self.spawn_check_interval:
-                        # Delay this bot's spawn time
-                        if postponed < (recent_spawns - self.max_concurrent_spawns):
-                            bot.spawn_time += self.spawn_check_interval * 2
-                            postponed += 1
-                            print(f"Postponed bot {bot.id} spawn to avoid concurrent spawns")
-        
-        # Only update active bots
-        for bot in self.bots:
-            if bot.active or current_time >= bot.spawn_time:
-                if bot.update_bot(delta_time):
-                    changed_bots.append(bot.id)
-                
-        return changed_bots
+            spawn_delay = np.arange(count) * spawn_interval + rng.uniform(0.5, 2.0, count)
+            self.spawn_time[rows] = current_time + spawn_delay
+            self.active[rows] = False
+            for spawn_time, row in zip(self.spawn_time[rows].tolist(), rows.tolist()):
+                heapq.heappush(self.pending, (spawn_time, row))
+        else:
+            self.spawn_time[rows] = current_time
+            self.active[rows] = True
+            self.active_index = np.concatenate((self.active_index, rows))
+        
+        # Very limited number of trail bots for performance
+        trail_slots = count if use_light_trails else 0
+        if self.max_active_trails is not None:
+            trail_slots = max(0, min(trail_slots, self.max_active_trails - self.trails_count))
+        self.trails_count += trail_slots
+        self.use_trails[rows] = False
+        self.use_trails[rows[:trail_slots]] = True
+        
+        self.speed[rows] = rng.uniform(40, 80, count)
+        self.direction[rows] = rng.uniform(0, TWO_PI, count)
+        self.next_turn[rows] = current_time + rng.uniform(1, 5, count)
+        self.last_move[rows] = 0
+        self.x[rows] = rng.uniform(-HALF_SIZE, HALF_SIZE, count)
+        self.z[rows] = rng.uniform(-HALF_SIZE, HALF_SIZE, count)
         
+        self.ids.extend([""] * fresh)
+        self.positions.extend([None] * fresh)
+        for bot_id, row, x, z, rotation, speed, trails in zip(
+            bot_ids,
+            rows.tolist(),
+            self.x[rows].tolist(),
+            self.z[rows].tolist(),
+            self.direction[rows].tolist(),
+            self.speed[rows].tolist(),
+            self.use_trails[rows].tolist()
+        ):
+            self.ids[row] = bot_id
+            self.rows[bot_id] = row
+            self.positions[row] = position = _POSITION_TEMPLATE.copy()
+            position["x"] = x
+            position["z"] = z
+            position["rotation"] = rotation
+            position["speed"] = speed
+            position["useTrails"] = trails
+        self.count += fresh
+        self._grid = None
+        return rows.tolist()
+    
+    def remove_bot(self, bot_id: str):
+        """Remove a bot and return its row to the free list for the next create_bots"""
+        row = self.rows.pop(bot_id)
+        if self.active[row]:
+            self.active[row] = False
+            self.active_index = self.active_index[self.active_index != row]
+        else:
+            self.pending = [entry for entry in self.pending if entry[1] != row]
+            heapq.heapify(self.pending)
+        if self.use_trails[row]:
+            self.use_trails[row] = False
+            self.trails_count -= 1
+        self.ids[row] = ""
+        self.positions[row] = None
+        self._grid = None
+        self._free.append(row)
+    
+    def clear(self):
+        """Remove every bot, keeping the allocated columns for reuse"""
+        self.count = 0
+        self.ids = []
+        self.rows = {}
+        self.positions = []
+        self._free = []
+        self.pending = []
+        self.active_index = np.zeros(0, dtype=np.intp)
+        self.trails_count = 0
+        self._grid = None
+    
+    def set_light_trails(self, row: int, enabled: bool) -> bool:
+        """
+        Toggle light trails for one bot, within max_active_trails.
+        Returns whether the bot now has trails.
+        """
+        if bool(self.use_trails[row]) == enabled:
+            return enabled
+        if enabled and self.max_active_trails is not None and self.trails_count >= self.max_active_trails:
+            return False
+        self.use_trails[row] = enabled
+        self.trails_count += 1 if enabled else -1
+        self.positions[row]["useTrails"] = enabled
+        return enabled
+    
+    def update_bots(self, delta_time: float, current_time: float, turn_probability: float = 0.01,
+                    rows: Optional[np.ndarray] = None) -> Tuple[List[int], List[int]]:
+        """
+        Move bots by delta_time, or only those among rows if given (e.g. one
+        update bucket). Bots due to spawn by current_time are activated
+        whichever rows are given, and move from the next update.
+        Returns (rows that moved, rows that spawned).
+        """
+        n = self.count
+        if n == 0:
+            return [], []
+        
+        # Pop the bots whose spawn time has come
+        pending = self.pending
+        spawning = []
+        while pending and pending[0][0] <= current_time:
+            spawning.append(heapq.heappop(pending)[1])
+        
+        # If too many bots are due to spawn at once, postpone some
+        for i in spawning[self.max_concurrent_spawns:]:
+            self.spawn_time[i] = current_time + self.spawn_check_interval * 2
+            heapq.heappush(pending, (self.spawn_time[i], i))
+            logger.debug("Postponed bot %s spawn to avoid concurrent spawns", self.ids[i])
+        del spawning[self.max_concurrent_spawns:]
+        
+        # Throttle position updates to update_frequency per bot, looking
+        # only at bots that are already active
+        active_index = self.active_index if rows is None else rows[self.active[rows]]
+        due = current_time - self.last_move[active_index] >= self.update_frequency
+        moving_index = active_index[due]
+        self.last_move[moving_index] = current_time
+        
+        # Every random number this tick needs, in one draw, for the moving
+        # bots only; work per tick scales with them rather than with count
+        if len(moving_index):
+            rnd = self.rng.random((len(moving_index), RANDOM_COLUMNS), dtype=np.float32)
+            if step_bots is not None:
+                step_bots(moving_index, self.x, self.z, self.direction, self.speed,
+                          self.next_turn, current_time,
+                          delta_time, turn_probability, HALF_SIZE, rnd)
+            else:
+                self._step_bots(moving_index, current_time, delta_time, turn_probability, rnd)
+        
+        # Copy the new state into the moved bots' position dicts, which are
+        # what the game state and move broadcasts hand out
+        moved = moving_index.tolist()
+        positions = self.positions
+        for row, x, z, rotation in zip(
+            moved,
+            self.x[moving_index].tolist(),
+            self.z[moving_index].tolist(),
+            self.direction[moving_index].tolist()
+        ):
+            position = positions[row]
+            position["x"] = x
+            position["z"] = z
+            position["rotation"] = rotation
+        
+        if spawning:
+            self.active[spawning] = True
+            self.active_index = np.concatenate((self.active_index, spawning))
+            logger.debug("Activated %s bots", len(spawning))
+        self._grid = None
+        return moved, spawning
+    
+    def _build_grid(self) -> Dict[Tuple[int, int], List[int]]:
+        """Bucket active bots by grid cell"""
+        index = self.active_index
+        cx = np.floor_divide(self.x[index], GRID_CELL_SIZE).astype(np.int32).tolist()
+        cz = np.floor_divide(self.z[index], GRID_CELL_SIZE).astype(np.int32).tolist()
+        grid = {}
+        for cell, i in zip(zip(cx, cz), index.tolist()):
+            bucket = grid.get(cell)
+            if bucket is None:
+                grid[cell] = [i]
+            else:
+                bucket.append(i)
+        return grid
+    
+    def get_nearby_bots(self, bot_id: str) -> List[str]:
+        """
+        IDs of other active bots in the 3x3 block of grid cells around a bot,
+        i.e. every bot within GRID_CELL_SIZE of it (and some a little further)
+        """
+        row = self.rows[bot_id]
+        cx = int(self.x[row] // GRID_CELL_SIZE)
+        cz = int(self.z[row] // GRID_CELL_SIZE)
+        grid = self._grid
+        if grid is None:
+            grid = self._grid = self._build_grid()
+        ids = self.ids
+        return [
+            ids[i]
+            for dx in (-1, 0, 1)
+            for dz in (-1, 0, 1)
+            for i in grid.get((cx + dx, cz + dz), ())
+            if i != row
+        ]
+    
+    def _step_bots(self, index: np.ndarray, current_time: float, delta_time: float,
+                   turn_probability: float, rnd: np.ndarray):
+        """
+        NumPy version of bot_kernel.step_bots, used when Numba isn't installed.
+        Consumes the columns of rnd the same way the kernel does.
+        """
+        # Gather the moving rows, step them, and scatter them back
+        m = len(index)
+        x = self.x[index]
+        z = self.z[index]
+        direction = self.direction[index]
+        next_turn = self.next_turn[index]
+        
+        # Scheduled 45-90 degree turns, then a random chance of an additional
+        # 22.5-45 degree turn for more natural movement
+        turning = next_turn <= current_time
+        if turning.any():
+            r = rnd[turning]
+            signs = np.where(r[:, 0] < 0.5, 1.0, -1.0)
+            direction[turning] += signs * (math.pi/4 + r[:, 1] * math.pi/4)
+            next_turn[turning] = current_time + 1.0 + 4.0 * r[:, 2]
+            self.next_turn[index] = next_turn
+        extra = ~turning & (rnd[:, 3] < turn_probability)
+        if extra.any():
+            r = rnd[extra]
+            signs = np.where(r[:, 4] < 0.5, 1.0, -1.0)
+            direction[extra] += signs * (math.pi/8 + r[:, 5] * math.pi/8)
+        
+        # Update position based on direction and speed
+        step = np.take(self.speed, index, out=self._step[:m])
+        np.multiply(step, delta_time, out=step)
+        dx = np.sin(direction, out=self._sin[:m])
+        dz = np.cos(direction, out=self._cos[:m])
+        np.multiply(dx, step, out=dx)
+        np.multiply(dz, step, out=dz)
+        np.add(x, dx, out=x)
+        np.add(z, dz, out=z)
+        
+        # If hitting a boundary, bounce with a random angle. Few bots hit one
+        # per tick, so all rows are clamped and bounced with masks rather
+        # than by picking out those that did
+        over_x = np.abs(x) > HALF_SIZE
+        over_z = np.abs(z) > HALF_SIZE
+        np.clip(x, -HALF_SIZE, HALF_SIZE, out=x)
+        np.clip(z, -HALF_SIZE, HALF_SIZE, out=z)
+        direction[:] = np.where(over_x, math.pi - direction + (rnd[:, 6] * 0.4 - 0.2), direction)
+        direction[:] = np.where(over_z, -direction + (rnd[:, 7] * 0.4 - 0.2), direction)
+        
+        # Normalize direction once, after any turn or bounce. fmod keeps the
+        # sign, so this is within (-2π, 2π); clients only take its sin/cos
+        np.fmod(direction, TWO_PI, out=direction)
+        
+        self.x[index] = x
+        self.z[index] = z
+        self.direction[index] = direction
+    
     def get_active_bots(self) -> List[Dict]:
         """Return only active bots for rendering"""
-        return [bot.to_dict() for bot in self.bots if bot.active] 
\ No newline at end of file
+        index = self.active_index
+        ids = self.ids
+        return [
+            {
+                "id": ids[i],
+                "position": {
+                    "x": x,
+                    "y": 0.25,
+                    "z": z,
+                    "rotation": rotation,
+                    "speed": speed,
+                    "useTrails": trails
+                },
+                "is_eliminated": False,
+                "score": 0,
+                "is_bot": True,
+                "use_light_trails": trails,
+                "active": True
+            }
+            for i, x, z, rotation, speed, trails in zip(
+                index.tolist(),
+                self.x[index].tolist(),
+                self.z[index].tolist(),
+                self.direction[index].tolist(),
+                self.speed[index].tolist(),
+                self.use_trails[index].tolist()
+            )
+        ]
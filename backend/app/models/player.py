@@ -1,5 +1,8 @@
 from typing import Dict, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
+
+# Squared distance a player must move before the new position is rebroadcast
+MOVE_EPSILON_SQ = 0.01 ** 2
 
 class Position(BaseModel):
     x: float
@@ -7,25 +10,60 @@ class Position(BaseModel):
     z: float
     rotation: Optional[float] = None
 
-class Player(BaseModel):
-    id: str
-    position: Optional[Dict[str, Any]] = None
-    is_eliminated: bool = False
-    score: int = 0
+class Player:
+    """
+    Runtime player state. A plain __slots__ class rather than a pydantic
+    model: attributes are written on every move, and validation on each
+    assignment buys nothing once data is inside the server.
+    """
+    __slots__ = ("id", "position", "is_eliminated", "score", "_dict", "_last_broadcast_pos")
+    
+    def __init__(self, id: str, position: Optional[Dict[str, Any]] = None,
+                 is_eliminated: bool = False, score: int = 0):
+        self.id = id
+        self.position = position
+        self.is_eliminated = is_eliminated
+        self.score = score
+        # Serialized form built once and kept in sync by the mutators below
+        self._dict: Optional[Dict] = None
+        # Last position reported as worth rebroadcasting
+        self._last_broadcast_pos: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict:
-        return {
-            "id": self.id,
-            "position": self.position,
-            "is_eliminated": self.is_eliminated,
-            "score": self.score
-        }
+        if self._dict is None:
+            self._dict = {
+                "id": self.id,
+                "position": self.position,
+                "is_eliminated": self.is_eliminated,
+                "score": self.score
+            }
+        return self._dict
     
-    def update_position(self, position_data: Dict[str, Any]):
+    def update_position(self, position_data: Dict[str, Any]) -> bool:
+        """
+        Store the new position.
+        Returns True if it moved (or turned) noticeably since the last
+        position that returned True.
+        """
         self.position = position_data
+        if self._dict is not None:
+            self._dict["position"] = position_data
+        
+        last = self._last_broadcast_pos
+        if last is not None:
+            dx = position_data.get("x", 0.0) - last.get("x", 0.0)
+            dz = position_data.get("z", 0.0) - last.get("z", 0.0)
+            if dx * dx + dz * dz <= MOVE_EPSILON_SQ and position_data.get("rotation") == last.get("rotation"):
+                return False
+        self._last_broadcast_pos = position_data
+        return True
     
     def eliminate(self):
         self.is_eliminated = True
+        if self._dict is not None:
+            self._dict["is_eliminated"] = True
     
     def add_score(self, points: int):
-        self.score += points 
\ No newline at end of file
+        self.score += points
+        if self._dict is not None:
+            self._dict["score"] = self.score 
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Compact wire format for server messages.
+Field names and message types are shortened before encoding; clients get
+the mapping once per connection in a schema message and expand it back.
+"""
+from typing import Any, Dict
+
+# Full field name -> wire name
+WIRE_KEYS: Dict[str, str] = {
+    "type": "t",
+    "data": "d",
+    "player_id": "i",
+    "player_ids": "I",
+    "position": "p",
+    "rotation": "r",
+    "speed": "v",
+    "updates": "u",
+    "deltas": "D",
+    "is_bot": "b",
+    "use_light_trails": "l",
+    "active": "a",
+    "is_eliminated": "e",
+    "score": "s",
+    "players": "P",
+    "eliminated_players": "E",
+    "game_phase": "g",
+    "current_round": "c",
+    "player_count": "n",
+    "min_players": "m",
+    "max_players": "M",
+    "bot_count": "B",
+    "killer": "k",
+    "victim": "V",
+    "player_name": "N",
+    "message": "T",
+}
+
+# Full message type -> wire type
+WIRE_TYPES: Dict[str, str] = {
+    "game_state": "gs",
+    "batch": "b",
+    "player_joined": "pj",
+    "players_joined_bulk": "pjb",
+    "player_left": "pl",
+    "players_left": "pls",
+    "player_moved": "pm",
+    "players_moved": "pms",
+    "player_updated": "pu",
+    "player_eliminated": "pe",
+    "player_kill": "pk",
+    "chat_message": "cm",
+}
+
+# Fields whose value is a dict keyed by player ID; those keys are kept as-is
+# since an ID can collide with a wire name
+ID_KEYED_FIELDS = frozenset({"players", "updates", "deltas"})
+
+_TYPE_KEY = WIRE_KEYS["type"]
+_pack_key = WIRE_KEYS.get
+_PACKED_ID_KEYED_FIELDS = frozenset(WIRE_KEYS[key] for key in ID_KEYED_FIELDS)
+_UNPACK_KEYS = {short: full for full, short in WIRE_KEYS.items()}
+_UNPACK_TYPES = {short: full for full, short in WIRE_TYPES.items()}
+
+# Sent uncompacted right after accept, so the client can expand what follows
+SCHEMA_MESSAGE = {
+    "type": "schema",
+    "data": {"keys": _UNPACK_KEYS, "types": _UNPACK_TYPES}
+}
+
+def pack(value: Any, keep_keys: bool = False) -> Any:
+    """Shorten field names and message types, recursively"""
+    # Runs for every broadcast, mostly over position dicts of floats, so
+    # scalars are copied inline instead of going through a recursive call
+    if type(value) is dict:
+        packed = {}
+        for key, item in value.items():
+            if type(item) is dict or type(item) is list:
+                item = pack(item, not keep_keys and key in ID_KEYED_FIELDS)
+            packed[key if keep_keys else _pack_key(key, key)] = item
+        if keep_keys:
+            return packed
+        message_type = packed.get(_TYPE_KEY)
+        if type(message_type) is str:
+            packed[_TYPE_KEY] = WIRE_TYPES.get(message_type, message_type)
+        return packed
+    if type(value) is list:
+        return [pack(item) if type(item) is dict or type(item) is list else item for item in value]
+    return value
+
+def unpack(value: Any, keep_keys: bool = False) -> Any:
+    """Inverse of pack"""
+    if isinstance(value, dict):
+        if keep_keys:
+            return {key: unpack(item) for key, item in value.items()}
+        unpacked = {
+            _UNPACK_KEYS.get(key, key): unpack(item, key in _PACKED_ID_KEYED_FIELDS)
+            for key, item in value.items()
+        }
+        message_type = unpacked.get("type")
+        if isinstance(message_type, str):
+            unpacked["type"] = _UNPACK_TYPES.get(message_type, message_type)
+        return unpacked
+    if isinstance(value, list):
+        return [unpack(item) for item in value]
+    return value
@@ -1,9 +1,24 @@
+import asyncio
+import gzip
+from types import SimpleNamespace
+import orjson
 import pytest
+from fastapi import WebSocketDisconnect
 from fastapi.testclient import TestClient
+from app import main
 from app.main import app
+from app.wire import unpack
 
 client = TestClient(app)
 
+def receive_state(websocket):
+    """Read the wire schema, then return the gzip-compressed initial game_state"""
+    assert websocket.receive_json(mode="binary")["type"] == "schema"
+    return unpack(orjson.loads(gzip.decompress(websocket.receive_bytes())))
+
+def receive_message(websocket):
+    return unpack(websocket.receive_json(mode="binary"))
+
 def test_root():
     response = client.get("/")
     assert response.status_code == 200
@@ -12,7 +27,7 @@ def test_root():
 def test_websocket_connection():
     with client.websocket_connect("/ws/test-player") as websocket:
         # Test receiving initial game state
-        data = websocket.receive_json()
+        data = receive_state(websocket)
         assert data["type"] == "game_state"
         assert "players" in data["data"]
         assert "eliminated_players" in data["data"]
@@ -30,4 +45,124 @@ def test_websocket_connection():
         websocket.send_json({
             "type": "player_eliminated",
             "data": {}
-        }) 
\ No newline at end of file
+        })
+
+def test_metrics():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    data = response.json()
+    assert "connections" in data
+    assert "bot_update_ticks" in data
+
+def test_broadcast_reaches_all_clients():
+    with client.websocket_connect("/ws/alice-1") as alice:
+        assert receive_state(alice)["type"] == "game_state"
+        with client.websocket_connect("/ws/bob-1") as bob:
+            assert receive_state(bob)["type"] == "game_state"
+            # Broadcasts are pre-encoded once and sent as binary frames
+            assert receive_message(alice) == {"type": "player_joined", "data": {"player_id": "bob-1"}}
+            
+            bob.send_json({
+                "type": "chat_message",
+                "data": {"player_id": "bob-1", "player_name": "bob", "message": "hi"}
+            })
+            for websocket in (alice, bob):
+                message = receive_message(websocket)
+                assert message["type"] == "chat_message"
+                assert message["data"]["message"] == "hi"
+
+def test_join_rejected_when_last_slot_is_taken_during_handshake(monkeypatch):
+    # can_join passed, but the slot went to someone else before add_player
+    monkeypatch.setattr(main.game_state, "add_player", lambda player_id: False)
+    with client.websocket_connect("/ws/gina-1") as websocket:
+        assert websocket.receive_json(mode="binary")["type"] == "schema"
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_bytes()
+    assert closed.value.code == 1013
+    assert "gina-1" not in main.active_connections
+    assert "gina-1" not in main.pending_removal
+
+def test_invalid_json_keeps_connection_open():
+    with client.websocket_connect("/ws/carol-1") as websocket:
+        assert receive_state(websocket)["type"] == "game_state"
+        websocket.send_text("{not json")
+        websocket.send_json({
+            "type": "chat_message",
+            "data": {"player_id": "carol-1", "player_name": "carol", "message": "still here"}
+        })
+        assert receive_message(websocket)["data"]["message"] == "still here"
+
+def test_moves_are_broadcast_in_snapshots():
+    # Entering the client runs startup, which starts the snapshot loop
+    with TestClient(app) as snapshot_client:
+        with snapshot_client.websocket_connect("/ws/dave-1") as dave:
+            assert receive_state(dave)["type"] == "game_state"
+            with snapshot_client.websocket_connect("/ws/erin-1") as erin:
+                assert receive_state(erin)["type"] == "game_state"
+                assert receive_message(dave)["type"] == "player_joined"
+                
+                position = {"x": 4.0, "y": 0.5, "z": 6.0, "rotation": 1.0}
+                erin.send_json({"type": "player_move", "data": {"position": position}})
+                message = receive_message(dave)
+                assert message == {"type": "players_moved", "data": {"updates": {"erin-1": position}}}
+
+def test_large_message_is_parsed():
+    with client.websocket_connect("/ws/frank-1") as websocket:
+        assert receive_state(websocket)["type"] == "game_state"
+        long_message = "x" * 10000
+        websocket.send_json({
+            "type": "chat_message",
+            "data": {"player_id": "frank-1", "player_name": "frank", "message": long_message}
+        })
+        assert receive_message(websocket)["data"]["message"] == long_message
+
+async def run_reaper_once(monkeypatch):
+    """Run a single iteration of reaper_loop"""
+    sleeps = []
+    async def sleep(delay):
+        if sleeps:
+            raise asyncio.CancelledError
+        sleeps.append(delay)
+    monkeypatch.setattr(main, "asyncio", SimpleNamespace(sleep=sleep))
+    with pytest.raises(asyncio.CancelledError):
+        await main.reaper_loop()
+
+async def test_reaper_removes_players_who_did_not_reconnect(monkeypatch):
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(main, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(main, "REMOVAL_DELAY_SECONDS", 2)
+    # Earlier tests leave their own removals pending
+    monkeypatch.setattr(main, "pending_removal", {})
+    monkeypatch.setattr(main, "active_connections", {})
+    messages = []
+    async def broadcast(message, exclude=None, lossy=False):
+        messages.append(message)
+    monkeypatch.setattr(main, "broadcast", broadcast)
+    stopped = []
+    monkeypatch.setattr(main.game_state, "bot_update_task", object())
+    monkeypatch.setattr(main.game_state, "stop_bot_updates", lambda: stopped.append(True))
+    
+    for player_id in ("reap-1", "reap-2", "reap-back", "reap-late"):
+        main.game_state.add_player(player_id)
+    main.schedule_removal("reap-1")
+    main.schedule_removal("reap-2")
+    main.schedule_removal("reap-back")
+    main.active_connections["reap-back"] = object()
+    clock.now = 101.0
+    main.schedule_removal("reap-late")
+    
+    # Due players are removed and announced together; reconnected ones stay
+    clock.now = 102.0
+    await run_reaper_once(monkeypatch)
+    assert messages == [{"type": "players_left", "data": {"player_ids": ["reap-1", "reap-2"]}}]
+    assert "reap-1" not in main.game_state.players and "reap-back" in main.game_state.players
+    assert list(main.pending_removal) == ["reap-late"]
+    assert stopped == []
+    
+    # Bot updates stop once no players are connected
+    del main.active_connections["reap-back"]
+    main.game_state.remove_player("reap-back")
+    clock.now = 103.0
+    await run_reaper_once(monkeypatch)
+    assert messages[-1]["data"]["player_ids"] == ["reap-late"]
+    assert not main.pending_removal and stopped == [True]
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+from app.models import bot_player
+from app.models.bot_player import BotManager, BotPlayer
+
+@pytest.fixture(params=["kernel", "numpy"])
+def step_implementation(request, monkeypatch):
+    """Run with the Numba kernel (when installed) and with the NumPy fallback"""
+    if request.param == "kernel" and bot_player.step_bots is None:
+        pytest.skip("numba not installed")
+    if request.param == "numpy":
+        monkeypatch.setattr(bot_player, "step_bots", None)
+    return request.param
+
+def bot_ids(start, count):
+    return [f"bot_{i}" for i in range(start, start + count)]
+
+def test_bots_spawn_then_move_inside_arena(step_implementation):
+    manager = BotManager(capacity=4)
+    rows = manager.create_bots(bot_ids(1, 10), current_time=0.0)
+    assert rows == list(range(10))
+    assert manager.capacity >= 10
+    assert manager.get_active_bots() == []
+    
+    manager.max_concurrent_spawns = 10  # Skip spawn postponement
+    moved, spawned = manager.update_bots(0.1, current_time=100.0)
+    assert moved == [] and sorted(spawned) == rows
+    assert len(manager.get_active_bots()) == 10
+    
+    before = manager.x[:10].copy(), manager.z[:10].copy()
+    moved, spawned = manager.update_bots(0.1, current_time=101.0)
+    assert sorted(moved) == rows and spawned == []
+    assert not np.array_equal(before[0], manager.x[:10]) or not np.array_equal(before[1], manager.z[:10])
+    # Position dicts are synced from the columns
+    assert manager.positions[0]["x"] == pytest.approx(float(manager.x[0]))
+    
+    for tick in range(50):
+        manager.update_bots(1.0, current_time=102.0 + tick)
+    assert np.all(np.abs(manager.x[:10]) <= 250) and np.all(np.abs(manager.z[:10]) <= 250)
+
+def test_concurrent_spawns_are_postponed():
+    manager = BotManager()
+    manager.create_bots(bot_ids(1, 5), current_time=0.0)
+    
+    _, spawned = manager.update_bots(0.1, current_time=100.0)
+    assert len(spawned) == manager.max_concurrent_spawns
+    assert len(manager.get_active_bots()) == manager.max_concurrent_spawns
+    assert len(manager.pending) == 5 - manager.max_concurrent_spawns
+
+def test_update_is_limited_to_given_rows():
+    manager = BotManager(seed=1)
+    rows = manager.create_bots(bot_ids(1, 6), spawn_interval=0, current_time=0.0)
+    assert len(manager.get_active_bots()) == 6
+    
+    moved, _ = manager.update_bots(0.1, 1.0, rows=np.array(rows[:2], dtype=np.intp))
+    assert sorted(moved) == rows[:2]
+
+def test_trail_bots_are_limited():
+    manager = BotManager()
+    manager.create_bots(bot_ids(1, 3))
+    manager.create_bots(bot_ids(4, 3))
+    assert np.count_nonzero(manager.use_trails[:manager.count]) == manager.max_active_trails
+    
+    # Removing a trail bot frees its trail for the next bot created
+    manager.remove_bot("bot_1")
+    assert manager.trails_count == manager.max_active_trails - 1
+    manager.create_bots(bot_ids(7, 1))
+    assert np.count_nonzero(manager.use_trails[:manager.count]) == manager.max_active_trails
+
+def test_kernel_matches_numpy_fallback(monkeypatch):
+    if bot_player.step_bots is None:
+        pytest.skip("numba not installed")
+    
+    def run():
+        manager = BotManager(seed=7)
+        manager.create_bots(bot_ids(1, 200), spawn_interval=0, current_time=0.0)
+        for tick in range(20):
+            manager.update_bots(1.0, current_time=1.0 + tick, turn_probability=0.3)
+        return manager
+    
+    compiled = run()
+    monkeypatch.setattr(bot_player, "step_bots", None)
+    fallback = run()
+    # float32 columns, and the kernel is built with fastmath
+    assert np.allclose(compiled.x[:200], fallback.x[:200], atol=1e-2)
+    assert np.allclose(compiled.z[:200], fallback.z[:200], atol=1e-2)
+    assert np.allclose(compiled.direction[:200], fallback.direction[:200], atol=1e-3)
+
+def test_nearby_bots_come_from_surrounding_cells():
+    manager = BotManager(seed=3)
+    manager.create_bots(bot_ids(1, 4), spawn_interval=0)
+    
+    manager.x[:4] = [5.0, 25.0, 45.0, -100.0]
+    manager.z[:4] = [0.0, 5.0, 5.0, -100.0]
+    assert sorted(manager.get_nearby_bots("bot_1")) == ["bot_2"]
+    assert sorted(manager.get_nearby_bots("bot_2")) == ["bot_1", "bot_3"]
+    assert manager.get_nearby_bots("bot_4") == []
+
+def test_removed_bot_rows_are_reused():
+    manager = BotManager(capacity=4)
+    manager.create_bots(bot_ids(1, 4), spawn_interval=0, current_time=0.0)
+    
+    manager.remove_bot("bot_2")
+    assert "bot_2" not in [bot["id"] for bot in manager.get_active_bots()]
+    assert 1 not in manager.update_bots(0.1, 1.0)[0]
+    
+    assert manager.create_bots(["bot_5"], spawn_interval=0) == [1]
+    assert manager.count == 4 and manager.capacity == 4
+    assert manager.rows["bot_5"] == 1
+
+def test_bot_player_is_a_view_of_its_row():
+    manager = BotManager(max_active_trails=None)
+    row = manager.create_bots(["bot_1"], use_light_trails=False, spawn_interval=0)[0]
+    bot = BotPlayer(manager, row)
+    assert bot.id == "bot_1" and bot.position is manager.positions[row]
+    assert bot.speed == pytest.approx(float(manager.speed[row]))
+    
+    data = bot.to_dict()
+    bot.set_light_trails(True)
+    assert manager.use_trails[row] and manager.trails_count == 1
+    assert data["use_light_trails"] is True and data["position"]["useTrails"] is True
@@ -0,0 +1,91 @@
+import asyncio
+import orjson
+from app import connection as connection_module
+from app import main
+from app.connection import ClientConnection, MAX_QUEUED_MESSAGES
+from app.wire import unpack
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+    
+    async def send_bytes(self, data: bytes):
+        self.frames.append(data)
+
+async def test_queued_messages_are_sent_as_one_batch():
+    websocket = FakeWebSocket()
+    connection = ClientConnection("player1", websocket)
+    for i in range(3):
+        connection.enqueue(orjson.dumps({"type": "player_moved", "data": {"seq": i}}))
+    
+    connection.start(lambda conn, error: None)
+    await asyncio.sleep(0.01)
+    connection.stop()
+    
+    assert len(websocket.frames) == 1
+    frame = unpack(orjson.loads(websocket.frames[0]))
+    assert frame["type"] == "batch"
+    assert [message["data"]["seq"] for message in frame["data"]] == [0, 1, 2]
+
+async def test_single_message_is_sent_unwrapped():
+    websocket = FakeWebSocket()
+    connection = ClientConnection("player1", websocket)
+    connection.start(lambda conn, error: None)
+    connection.enqueue(orjson.dumps({"type": "chat_message", "data": {}}))
+    await asyncio.sleep(0.01)
+    connection.stop()
+    
+    assert [orjson.loads(frame)["type"] for frame in websocket.frames] == ["chat_message"]
+
+def test_overflow_drops_oldest_lossy_message():
+    connection = ClientConnection("player1", FakeWebSocket())
+    connection.enqueue(b'"reliable"')
+    for i in range(MAX_QUEUED_MESSAGES - 1):
+        connection.enqueue(orjson.dumps(i), lossy=True)
+    connection.enqueue(b'"latest"', lossy=True)
+    
+    payloads = [payload for payload, _ in connection.pending]
+    assert len(payloads) == MAX_QUEUED_MESSAGES
+    assert payloads[0] == b'"reliable"'
+    assert payloads[1] == b"1"
+    assert payloads[-1] == b'"latest"'
+    assert connection.dropped == 1
+
+async def test_stalled_send_reports_error(monkeypatch):
+    class StalledWebSocket:
+        async def send_bytes(self, data: bytes):
+            await asyncio.sleep(10)
+    
+    monkeypatch.setattr(connection_module, "SEND_TIMEOUT_SECONDS", 0.01)
+    errors = []
+    connection = ClientConnection("player1", StalledWebSocket())
+    connection.start(lambda conn, error: errors.append(error))
+    connection.enqueue(b"{}")
+    await asyncio.sleep(0.05)
+    
+    assert len(errors) == 1 and isinstance(errors[0], asyncio.TimeoutError)
+    assert connection.sender_task is None
+
+async def test_stalled_connection_is_closed_and_scheduled_for_removal(monkeypatch):
+    class StalledWebSocket:
+        close_code = None
+        
+        async def send_bytes(self, data: bytes):
+            await asyncio.sleep(10)
+        
+        async def close(self, code: int = 1000):
+            self.close_code = code
+    
+    monkeypatch.setattr(connection_module, "SEND_TIMEOUT_SECONDS", 0.01)
+    websocket = StalledWebSocket()
+    connection = ClientConnection("stalled-1", websocket)
+    main.set_connection("stalled-1", connection)
+    connection.start(main.handle_send_error)
+    connection.enqueue(b"{}")
+    await asyncio.sleep(0.05)
+    
+    # The client sees its socket closed, so its reconnect logic runs
+    assert websocket.close_code == 1011
+    assert "stalled-1" not in main.active_connections
+    assert "stalled-1" in main.pending_removal
+    main.pending_removal.pop("stalled-1")
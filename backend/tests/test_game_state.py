@@ -1,6 +1,8 @@
 import pytest
+import orjson
 from app.game.game_state import GameState
 from app.models.player import Player
+from app.wire import unpack
 
 @pytest.fixture
 def game_state():
@@ -58,4 +60,89 @@ def test_start_game(game_state):
     game_state.start_game()
     assert game_state.game_phase == "playing"
     assert game_state.current_round == 1
-    assert len(game_state.eliminated_players) == 0 
\ No newline at end of file
+    assert len(game_state.eliminated_players) == 0
+
+def test_remove_all_bots_clears_eliminated_bots(game_state):
+    game_state.add_player("player1")
+    game_state.add_bots(2)
+    game_state.eliminate_player("player1")
+    game_state.eliminate_player("Bot_1")
+    game_state.remove_all_bots()
+    assert game_state.eliminated_players == {"player1"}
+
+def test_get_state_is_cached_until_mutation(game_state):
+    game_state.add_player("player1")
+    state = game_state.get_state()
+    assert game_state.get_state() is state
+    
+    # Position updates are reflected in place without a rebuild
+    game_state.update_player_position("player1", {"x": 1.0, "y": 0.0, "z": 2.0})
+    assert game_state.get_state() is state
+    assert state["players"]["player1"]["position"]["x"] == 1.0
+    
+    game_state.add_player("player2")
+    assert game_state.get_state() is not state
+    assert game_state.get_state()["player_count"] == 2
+
+def test_eliminated_bot_leaves_alive_bots(game_state):
+    game_state.add_bots(2)
+    game_state.eliminate_player("Bot_1")
+    assert "Bot_1" in game_state.bots
+    assert list(game_state.alive_bots) == ["Bot_2"]
+
+def test_player_slots_are_reused(game_state):
+    for i in range(game_state.max_players):
+        game_state.add_player(f"player{i+1}")
+    assert game_state.can_join("extra_player") is False
+    assert game_state.can_join("player1") is True
+    
+    game_state.remove_player("player3")
+    assert game_state.add_player("extra_player") is True
+    assert game_state.player_slots["extra_player"] == 2
+
+def test_eliminated_player_does_not_count_towards_start(game_state):
+    game_state.add_player("player1")
+    game_state.add_player("player2")
+    game_state.eliminate_player("player2")
+    assert game_state.eliminated_players == {"player2"}
+    assert game_state.can_start_game() is False
+
+def test_bots_are_spread_across_buckets(game_state):
+    game_state.add_bots(len(game_state.bot_buckets) * 2)
+    assert all(len(bucket) == 2 for bucket in game_state.bot_buckets)
+    
+    game_state.eliminate_player("Bot_1")
+    assert all("Bot_1" not in bucket for bucket in game_state.bot_buckets)
+
+def test_update_player_position_ignores_tiny_moves(game_state):
+    game_state.add_player("player1")
+    assert game_state.update_player_position("player1", {"x": 1.0, "y": 0.0, "z": 1.0}) is True
+    assert game_state.update_player_position("player1", {"x": 1.001, "y": 0.0, "z": 1.0}) is False
+    assert game_state.update_player_position("player1", {"x": 2.0, "y": 0.0, "z": 1.0}) is True
+    assert game_state.update_player_position("unknown", {"x": 2.0, "y": 0.0, "z": 1.0}) is False
+
+def test_state_bytes_reencoded_only_after_changes(game_state):
+    game_state.add_player("player1")
+    encoded = game_state.get_state_bytes()
+    assert game_state.get_state_bytes() is encoded
+    
+    game_state.update_player_position("player1", {"x": 3.0, "y": 0.0, "z": 2.0})
+    encoded = game_state.get_state_bytes()
+    assert unpack(orjson.loads(encoded))["data"]["players"]["player1"]["position"]["x"] == 3.0
+    
+    game_state.add_player("player2")
+    assert "player2" in unpack(orjson.loads(game_state.get_state_bytes()))["data"]["players"]
+
+def test_bot_bucket_moves_bots_through_manager(game_state):
+    game_state.add_bots(len(game_state.bot_buckets))
+    state = game_state.get_state()
+    bot_id, bot = next(iter(game_state.bot_buckets[0].items()))
+    x = bot.position["x"]
+    
+    updates = game_state.update_bot_bucket(0, 0.1, bot.manager.next_turn[bot.row] - 0.5)
+    assert list(updates) == [bot_id]
+    assert updates[bot_id] is state["players"][bot_id]["position"]
+    assert bot.position["x"] != x
+    
+    game_state.eliminate_player(bot_id)
+    assert game_state.update_bot_bucket(0, 0.1, 1e9) == {}
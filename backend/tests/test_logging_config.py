@@ -0,0 +1,19 @@
+import logging
+import logging.handlers
+from app.logging_config import setup_logging, shutdown_logging
+
+def queue_handlers():
+    return [h for h in logging.getLogger().handlers if isinstance(h, logging.handlers.QueueHandler)]
+
+def test_shutdown_detaches_queue_handler():
+    setup_logging()
+    setup_logging()
+    assert len(queue_handlers()) == 1
+    
+    shutdown_logging()
+    assert queue_handlers() == []
+    
+    # A restart after shutdown installs a single handler again
+    setup_logging()
+    assert len(queue_handlers()) == 1
+    shutdown_logging()
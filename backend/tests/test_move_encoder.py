@@ -0,0 +1,22 @@
+from app.game.move_encoder import MoveEncoder
+
+def test_only_changed_fields_sent_between_keyframes():
+    encoder = MoveEncoder(keyframe_interval=1.0)
+    position = {"x": 1.0, "y": 0.5, "z": 2.0, "rotation": 0.0}
+    
+    assert encoder.encode("p1", position, 10.0) == (True, position)
+    assert encoder.encode("p1", {**position, "x": 1.5}, 10.4) == (False, {"x": 1.5})
+    assert encoder.encode("p1", {**position, "x": 2.0}, 10.8) == (False, {"x": 2.0})
+    # Positions are sent in full again once keyframe_interval has passed,
+    # however many deltas clients dropped in between
+    assert encoder.encode("p1", {**position, "x": 2.5}, 11.0)[0] is True
+    assert encoder.encode("p1", {**position, "x": 3.0}, 11.5)[0] is False
+
+def test_forgotten_player_restarts_with_keyframe():
+    encoder = MoveEncoder()
+    encoder.encode("bot1", {"x": 0.0, "z": 0.0})
+    data = encoder.encode_updates({"bot1": {"x": 1.0, "z": 0.0}, "bot2": {"x": 5.0, "z": 5.0}})
+    assert data == {"updates": {"bot2": {"x": 5.0, "z": 5.0}}, "deltas": {"bot1": {"x": 1.0}}}
+    
+    encoder.forget("bot1")
+    assert encoder.encode_updates({"bot1": {"x": 2.0, "z": 0.0}}) == {"updates": {"bot1": {"x": 2.0, "z": 0.0}}}
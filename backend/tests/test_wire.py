@@ -0,0 +1,29 @@
+from app.wire import pack, unpack
+
+def test_pack_shortens_keys_and_types():
+    message = {
+        "type": "players_moved",
+        "data": {"updates": {"Bot_1": {"x": 1.0, "y": 0.25, "z": 2.0, "rotation": 0.5}}}
+    }
+    packed = pack(message)
+    assert packed == {"t": "pms", "d": {"u": {"Bot_1": {"x": 1.0, "y": 0.25, "z": 2.0, "r": 0.5}}}}
+    assert unpack(packed) == message
+
+def test_unknown_keys_pass_through():
+    message = {"type": "custom_event", "data": [{"player_id": "p-1", "extra": True}]}
+    assert pack(message) == {"t": "custom_event", "d": [{"i": "p-1", "extra": True}]}
+    assert unpack(pack(message)) == message
+
+def test_player_id_keys_are_not_translated():
+    # Player IDs come from the URL and can match a wire name
+    message = {
+        "type": "game_state",
+        "data": {"players": {"s": {"id": "s", "score": 1}, "p": {"id": "p", "score": 0}}}
+    }
+    packed = pack(message)
+    assert packed["d"]["P"] == {"s": {"id": "s", "s": 1}, "p": {"id": "p", "s": 0}}
+    assert unpack(packed) == message
+    
+    moved = {"type": "players_moved", "data": {"updates": {"t": {"x": 1.0}}, "deltas": {"i": {"rotation": 0.5}}}}
+    assert pack(moved)["d"] == {"u": {"t": {"x": 1.0}}, "D": {"i": {"r": 0.5}}}
+    assert unpack(pack(moved)) == moved
@@ -21,10 +21,13 @@ export type Player = {
 };
 
 export type GameEvent = {
-  type: 'game_state' | 'player_joined' | 'player_left' | 'player_moved' | 'player_eliminated' | 'player_kill' | 'chat_message';
+  type: 'game_state' | 'batch' | 'player_joined' | 'players_joined_bulk' | 'player_left' | 'players_left' | 'player_moved' | 'players_moved' | 'player_eliminated' | 'player_kill' | 'chat_message';
   data: any;
 };
 
+// Wire fields whose value is a map keyed by player ID
+const ID_KEYED_FIELDS = new Set(['players', 'updates', 'deltas']);
+
 export class GameClient {
   private socket: WebSocket | null = null;
   private playerId: string | null = null;
@@ -35,6 +38,16 @@ export class GameClient {
   private sessionStorageKey = 'tron_game_player_session';
   private serverUrl: string;
   private lastConnectTime: number = 0;
+  private textDecoder = new TextDecoder();
+  // Set while a gzip-compressed frame is being decompressed; frames arriving
+  // meanwhile are chained behind it so events keep their order
+  private pendingDecode: Promise<void> | null = null;
+  // Wire name -> full name for keys and message types, from the schema
+  // message the server sends on connect
+  private wireKeys: Map<string, string> | null = null;
+  private wireTypes: Map<string, string> = new Map();
+  // Last full position per player, the baseline delta-encoded moves apply to
+  private knownPositions: Map<string, any> = new Map();
 
   constructor(serverUrl?: string) {
     // Use provided server URL, environment variable, or fallback to local development
@@ -109,6 +122,7 @@ export class GameClient {
         }, 10000); // 10 second timeout
 
         this.socket = new WebSocket(`${this.serverUrl}/ws/${this.playerId}`);
+        this.socket.binaryType = 'arraybuffer';
 
         this.socket.onopen = () => {
           console.log('[DEBUG] WebSocket connection established successfully');
@@ -137,8 +151,7 @@ export class GameClient {
 
         this.socket.onmessage = (event) => {
           try {
-            const message = JSON.parse(event.data);
-            this.handleGameEvent(message);
+            this.receiveMessage(event.data);
           } catch (error) {
             console.error('Error parsing message:', error);
           }
@@ -149,6 +162,77 @@ export class GameClient {
     });
   }
 
+  // Broadcasts arrive as binary frames of UTF-8 JSON, direct replies as text
+  private parseMessage(data: string | ArrayBuffer): any {
+    return JSON.parse(typeof data === 'string' ? data : this.textDecoder.decode(data));
+  }
+
+  // The initial game_state arrives gzip-compressed (starting with the gzip
+  // magic bytes), which needs an asynchronous decompression
+  private isGzip(data: string | ArrayBuffer): data is ArrayBuffer {
+    if (typeof data === 'string' || data.byteLength < 2) return false;
+    const bytes = new Uint8Array(data, 0, 2);
+    return bytes[0] === 0x1f && bytes[1] === 0x8b;
+  }
+
+  private async decompress(data: ArrayBuffer): Promise<any> {
+    const stream = new Blob([data]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return JSON.parse(await new Response(stream).text());
+  }
+
+  private receiveMessage(data: string | ArrayBuffer) {
+    if (!this.pendingDecode && !this.isGzip(data)) {
+      this.dispatchMessage(this.parseMessage(data));
+      return;
+    }
+
+    const decode = (this.pendingDecode ?? Promise.resolve())
+      .then(() => (this.isGzip(data) ? this.decompress(data) : this.parseMessage(data)))
+      .then(message => this.dispatchMessage(message))
+      .catch(error => console.error('Error decoding message:', error))
+      .finally(() => {
+        if (this.pendingDecode === decode) {
+          this.pendingDecode = null;
+        }
+      });
+    this.pendingDecode = decode;
+  }
+
+  private dispatchMessage(message: any) {
+    if (message.type === 'schema') {
+      this.wireKeys = new Map(Object.entries(message.data.keys));
+      this.wireTypes = new Map(Object.entries(message.data.types));
+      return;
+    }
+    this.handleGameEvent(this.wireKeys ? this.unpack(message) : message);
+  }
+
+  // Expand the compact wire format back to full key and type names.
+  // Maps keyed by player ID keep their keys, since an ID can match a wire name
+  private unpack(value: any, keepKeys = false): any {
+    if (Array.isArray(value)) {
+      return value.map(item => this.unpack(item));
+    }
+    if (value === null || typeof value !== 'object') {
+      return value;
+    }
+    const result: any = {};
+    if (keepKeys) {
+      Object.entries(value).forEach(([key, item]) => {
+        result[key] = this.unpack(item);
+      });
+      return result;
+    }
+    Object.entries(value).forEach(([key, item]) => {
+      const fullKey = this.wireKeys!.get(key) ?? key;
+      result[fullKey] = this.unpack(item, ID_KEYED_FIELDS.has(fullKey));
+    });
+    if (typeof result.type === 'string') {
+      result.type = this.wireTypes.get(result.type) ?? result.type;
+    }
+    return result;
+  }
+
   // Generate a more stable session ID
   private generateSessionId(): string {
     // Use timestamp + random to create a more unique ID
@@ -231,6 +315,7 @@ export class GameClient {
       
       // Create a new connection
       this.socket = new WebSocket(`${this.serverUrl}/ws/${this.playerId}`);
+      this.socket.binaryType = 'arraybuffer';
       
       this.socket.onopen = () => {
         console.log(`[DEBUG] Reconnection successful for player ${this.playerId}`);
@@ -253,8 +338,7 @@ export class GameClient {
       
       this.socket.onmessage = (event) => {
         try {
-          const message = JSON.parse(event.data);
-          this.handleGameEvent(message);
+          this.receiveMessage(event.data);
         } catch (error) {
           console.error('Error parsing message during reconnection:', error);
         }
@@ -360,6 +444,58 @@ export class GameClient {
   private handleGameEvent(message: any) {
     const { type, data } = message;
     
+    // Several queued messages sent in one frame
+    if (type === 'batch') {
+      data.forEach((queued: any) => this.handleGameEvent(queued));
+      return;
+    }
+    
+    // Movement snapshot: replay each update as an individual player_moved.
+    // "updates" hold full positions, "deltas" only the fields that changed.
+    // Snapshots go to everyone, so skip our own position
+    if (type === 'players_moved') {
+      Object.entries(data.updates).forEach(([player_id, position]) => {
+        if (player_id !== this.playerId) {
+          this.handleGameEvent({ type: 'player_moved', data: { player_id, position } });
+        }
+      });
+      if (data.deltas) {
+        Object.entries(data.deltas).forEach(([player_id, fields]) => {
+          if (player_id !== this.playerId) {
+            this.applyMoveDelta(player_id, fields);
+          }
+        });
+      }
+      return;
+    }
+    
+    // Keep baselines current for later deltas
+    if (type === 'player_moved') {
+      this.knownPositions.set(data.player_id, data.position);
+    } else if (type === 'game_state') {
+      Object.entries(data.players).forEach(([player_id, player]: [string, any]) => {
+        if (player && player.position) {
+          this.knownPositions.set(player_id, player.position);
+        }
+      });
+    } else if (type === 'player_left') {
+      this.knownPositions.delete(data.player_id);
+    }
+    
+    // Bulk joins: replay each as an individual player_joined
+    if (type === 'players_joined_bulk') {
+      data.forEach((joined: any) => this.handleGameEvent({ type: 'player_joined', data: joined }));
+      return;
+    }
+    
+    // Batched departures: replay each as an individual player_left
+    if (type === 'players_left') {
+      data.player_ids.forEach((player_id: string) => {
+        this.handleGameEvent({ type: 'player_left', data: { player_id } });
+      });
+      return;
+    }
+    
     // Inform any registered handlers
     const handlers = this.eventHandlers.get(type) || [];
     handlers.forEach(handler => handler(data));
@@ -378,6 +514,16 @@ export class GameClient {
     }
   }
   
+  /**
+   * Rebuild a full position from a delta and replay it as a player_moved
+   */
+  private applyMoveDelta(player_id: string, fields: any) {
+    const known = this.knownPositions.get(player_id);
+    // Without a baseline the delta can't be applied; the next keyframe resyncs
+    if (!known) return;
+    this.handleGameEvent({ type: 'player_moved', data: { player_id, position: { ...known, ...fields } } });
+  }
+
   /**
    * Manually dispatch an event to handlers
    */